@@ -0,0 +1,202 @@
+"""
+latency_stats.py — Fixed-memory, thread-safe latency statistics with percentiles.
+
+LatencyHistogram is HDR-histogram style: values (nanoseconds) fall into log-linear
+buckets — every power of two is split into 32 linear sub-buckets — so any value
+up to ~292 years is kept with ≤ ~3% relative error in at most 2048 counters.
+
+LatencyStats shards histograms per thread: each thread records into its own
+histograms without taking a lock, and readers merge all shards on demand.
+Use it for thread lifetimes, task durations, queue wait times — anything timed.
+"""
+
+import threading
+from contextlib import contextmanager
+from time import perf_counter, perf_counter_ns
+
+_SUB_BITS = 5
+_SUB = 1 << _SUB_BITS       # linear sub-buckets per power of two
+_NUM_BUCKETS = 64 * _SUB
+
+
+def _bucket_index(ns: int) -> int:
+    if ns < _SUB:
+        return ns
+    shift = ns.bit_length() - _SUB_BITS - 1
+    return (shift + 1) * _SUB + (ns >> shift) - _SUB
+
+
+def _bucket_bounds(index: int) -> tuple:
+    if index < _SUB:
+        return index, index
+    shift = index // _SUB - 1
+    mantissa = _SUB + index % _SUB
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of non-negative integer durations in nanoseconds.
+    Not synchronized: one writer at a time (LatencyStats gives each thread its own).
+    """
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.buckets = [0] * _NUM_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, ns: int):
+        ns = int(ns)
+        if ns < 0:
+            ns = 0
+        self.buckets[_bucket_index(ns)] += 1
+        if not self.count or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        self.count += 1
+        self.total += ns
+
+    def merge(self, other: "LatencyHistogram"):
+        if not other.count:
+            return
+        buckets = self.buckets
+        for i, n in enumerate(other.buckets):
+            if n:
+                buckets[i] += n
+        if not self.count or other.min < self.min:
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def percentile(self, p: float) -> int:
+        """
+        Value at the p-th percentile (p in 0..100), accurate to the bucket width.
+        """
+        if not self.count:
+            return 0
+        rank = max(1, round(p / 100 * self.count))
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                low, high = _bucket_bounds(i)
+                return min(max((low + high) // 2, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class LatencyStats:
+    """
+    Named latency histograms with per-thread shards, merged when read.
+
+    record() never blocks on other threads; summary()/snapshot() take a short
+    registry lock and merge the shards of every thread that recorded that name.
+    Shards of threads that have exited are folded into one base histogram per
+    name and dropped, so memory stays bounded however many threads come and go.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []           # [(thread, {name: LatencyHistogram})], one per live recording thread
+        self._base = {}             # {name: LatencyHistogram}: folded shards of exited threads
+        self._shards_lock = threading.Lock()
+        self._started = perf_counter()
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._collect_locked()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _collect_locked(self):
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+                continue
+            for name, hist in shard.items():  # no more writes to this shard
+                base = self._base.get(name)
+                if base is None:
+                    base = self._base[name] = LatencyHistogram()
+                base.merge(hist)
+        self._shards = live
+
+    def record_ns(self, name: str, ns: int):
+        shard = self._shard()
+        hist = shard.get(name)
+        if hist is None:
+            hist = shard[name] = LatencyHistogram()
+        hist.record(ns)
+
+    def record(self, name: str, seconds: float):
+        self.record_ns(name, seconds * 1e9)
+
+    @contextmanager
+    def time(self, name: str):
+        t0 = perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record_ns(name, perf_counter_ns() - t0)
+
+    def names(self) -> list:
+        with self._shards_lock:
+            self._collect_locked()
+            shards = [list(self._base), *(shard for _, shard in self._shards)]
+        seen = []
+        for shard in shards:
+            for name in list(shard):
+                if name not in seen:
+                    seen.append(name)
+        return seen
+
+    def snapshot(self, name: str) -> LatencyHistogram:
+        merged = LatencyHistogram()
+        with self._shards_lock:
+            self._collect_locked()
+            base = self._base.get(name)
+            if base is not None:
+                merged.merge(base)  # under the lock: _collect_locked may be adding to it
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            hist = shard.get(name)
+            if hist is not None:
+                merged.merge(hist)
+        return merged
+
+    def summary(self, name: str) -> dict:
+        """
+        Count, rate (per second since creation/reset) and percentiles in seconds.
+        """
+        hist = self.snapshot(name)
+        elapsed = perf_counter() - self._started
+        return {
+            "count": hist.count,
+            "rate": hist.count / elapsed if elapsed > 0 else 0.0,
+            "min": hist.min / 1e9,
+            "mean": hist.mean / 1e9,
+            "p50": hist.percentile(50) / 1e9,
+            "p90": hist.percentile(90) / 1e9,
+            "p99": hist.percentile(99) / 1e9,
+            "p999": hist.percentile(99.9) / 1e9,
+            "max": hist.max / 1e9,
+            "total": hist.total / 1e9,
+        }
+
+    def reset(self):
+        with self._shards_lock:
+            self._shards = []
+            self._base = {}
+            self._local = threading.local()
+            self._started = perf_counter()
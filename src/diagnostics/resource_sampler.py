@@ -0,0 +1,231 @@
+"""
+resource_sampler.py — Sample per-thread CPU and process memory over time.
+
+A background thread periodically records, via psutil:
+- user/system CPU time of every OS thread (mapped to threading names via native_id),
+- process RSS, thread count and voluntary/involuntary context switches.
+
+Samples are stored in array('d') columns, so a long run costs a few bytes per sample.
+The report shows which threads burn CPU and which mostly sit blocked;
+plot() draws RSS / thread count / CPU over time.
+
+The demo runs the workloads from threading_vs_executor.py under the sampler.
+"""
+
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import psutil
+
+from src.utils.logger import log
+
+
+class _ThreadSeries:
+    """
+    CPU time samples of one OS thread. psutil's user/system times are cumulative
+    since the thread started: a thread born during sampling counts from zero and
+    from the sample before it was first seen; one already running counts from its
+    first sample.
+    """
+    __slots__ = ("name", "start", "base_cpu", "ts", "user", "system")
+
+    def __init__(self, name: str, start: float, base_cpu: float):
+        self.name = name            # None until the threading name is known
+        self.start = start
+        self.base_cpu = base_cpu
+        self.ts = array("d")
+        self.user = array("d")
+        self.system = array("d")
+
+
+class ResourceSampler(threading.Thread):
+    """
+    Background sampler of process and per-thread resource usage.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        super().__init__(name="ResourceSampler", daemon=True)
+        self.interval = interval
+        self._process = psutil.Process()
+        self._stop_event = threading.Event()
+
+        # Process-level time series (one entry per sample)
+        self.ts = array("d")
+        self.rss = array("d")
+        self.num_threads = array("d")
+        self.ctx_voluntary = array("d")
+        self.ctx_involuntary = array("d")
+        self.cpu_user = array("d")
+        self.cpu_system = array("d")
+
+        self.threads = {}           # native thread id → _ThreadSeries
+        self._names = {}            # native thread id → threading name
+        self.self_cpu = 0.0         # CPU seconds the sampler itself used
+        self._t0 = None
+
+    def _refresh_names(self):
+        self._names = {t.native_id: t.name for t in threading.enumerate() if t.native_id is not None}
+
+    def _sample(self):
+        proc = self._process
+        now = perf_counter() - self._t0
+
+        with proc.oneshot():
+            mem = proc.memory_info()
+            ctx = proc.num_ctx_switches()
+            cpu = proc.cpu_times()
+            os_threads = proc.threads()
+
+        self.ts.append(now)
+        self.rss.append(mem.rss)
+        self.num_threads.append(len(os_threads))
+        self.ctx_voluntary.append(ctx.voluntary)
+        self.ctx_involuntary.append(ctx.involuntary)
+        self.cpu_user.append(cpu.user)
+        self.cpu_system.append(cpu.system)
+
+        first_sample = len(self.ts) == 1
+        refreshed = False
+        for t in os_threads:
+            series = self.threads.get(t.id)
+            if series is None:
+                # Born since the previous sample, unless this is the first one
+                start = now if first_sample else self.ts[-2]
+                base_cpu = t.user_time + t.system_time if first_sample else 0.0
+                series = self.threads[t.id] = _ThreadSeries(None, start, base_cpu)
+            if series.name is None:
+                # Just-started threads publish native_id a moment after the OS sees
+                # them: keep sampling and pick the name up once it is known
+                if t.id not in self._names and not refreshed:
+                    self._refresh_names()
+                    refreshed = True
+                series.name = self._names.get(t.id)
+            series.ts.append(now)
+            series.user.append(t.user_time)
+            series.system.append(t.system_time)
+
+    def run(self):
+        self._t0 = perf_counter()
+        self._refresh_names()
+        cpu_start = time.thread_time()
+        while not self._stop_event.is_set():
+            self._sample()
+            self._stop_event.wait(self.interval)
+        self._sample()
+        self.self_cpu = time.thread_time() - cpu_start
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def thread_report(self) -> list:
+        """
+        Returns [(name, cpu seconds, observed seconds, cpu share), ...] sorted by CPU.
+        cpu share ≈ 1.0 → thread was running; ≈ 0.0 → it was blocked or sleeping.
+        Threads seen in a single sample are included; threads that started and
+        ended between two samples are never seen.
+        """
+        rows = []
+        for tid, series in self.threads.items():
+            cpu = series.user[-1] + series.system[-1] - series.base_cpu
+            observed = series.ts[-1] - series.start
+            rows.append((series.name or f"native-{tid}", cpu, observed, cpu / observed if observed > 0 else 0.0))
+        rows.sort(key=lambda r: r[1], reverse=True)
+        return rows
+
+    def log_report(self, label: str = "", top: int = 10):
+        if not self.ts:
+            return
+        duration = self.ts[-1] - self.ts[0]
+        process_cpu = (self.cpu_user[-1] - self.cpu_user[0]) + (self.cpu_system[-1] - self.cpu_system[0])
+
+        log(f"\n📈 Resources{f' — {label}' if label else ''}: {duration:.2f}s, "
+            f"process CPU {process_cpu:.2f}s ({process_cpu / duration * 100 if duration else 0:.0f}% of one core), "
+            f"peak RSS {max(self.rss) / 2**20:.1f} MiB, peak threads {int(max(self.num_threads))}, "
+            f"ctx switches +{int(self.ctx_voluntary[-1] - self.ctx_voluntary[0])} voluntary / "
+            f"+{int(self.ctx_involuntary[-1] - self.ctx_involuntary[0])} involuntary")
+
+        rows = self.thread_report()
+        burning = [r for r in rows if r[3] >= 0.5]
+        blocked = [r for r in rows if r[3] < 0.5]
+        log(f"🔥 {len(burning)} threads mostly running, 💤 {len(blocked)} mostly blocked")
+        for name, cpu, observed, share in rows[:top]:
+            state = "🔥 running" if share >= 0.5 else "💤 blocked"
+            log(f"{name:28s} cpu={cpu:6.3f}s over {observed:5.2f}s ({share * 100:5.1f}%) {state}")
+
+        log(f"Sampler overhead: {self.self_cpu * 1000:.1f}ms CPU for {len(self.ts)} samples")
+
+    def plot(self, path: str):
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        fig, (ax_mem, ax_thr, ax_cpu) = plt.subplots(3, 1, figsize=(8, 8), sharex=True)
+        ax_mem.plot(self.ts, [v / 2**20 for v in self.rss])
+        ax_mem.set_ylabel("RSS (MiB)")
+        ax_thr.plot(self.ts, self.num_threads)
+        ax_thr.set_ylabel("OS threads")
+
+        # Process CPU utilisation between consecutive samples (1.0 = one full core)
+        cpu_total = [u + s for u, s in zip(self.cpu_user, self.cpu_system)]
+        points = [
+            (self.ts[i], (cpu_total[i] - cpu_total[i - 1]) / (self.ts[i] - self.ts[i - 1]))
+            for i in range(1, len(self.ts)) if self.ts[i] > self.ts[i - 1]
+        ]
+        ax_cpu.plot([t for t, _ in points], [u for _, u in points])
+        ax_cpu.set_ylabel("CPU (cores)")
+        ax_cpu.set_xlabel("Time (s)")
+
+        fig.tight_layout()
+        fig.savefig(path, dpi=120)
+        plt.close(fig)
+        log(f"🖼️ Saved resource chart as '{path}'")
+
+
+def _run_threads(work_fn, num_tasks: int):
+    threads = [threading.Thread(target=work_fn, args=(i,), name=f"Raw-{i}") for i in range(num_tasks)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def _run_executor(work_fn, num_tasks: int, workers: int):
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Pool") as executor:
+        list(executor.map(work_fn, range(num_tasks)))
+
+
+def run_demo(num_tasks: int = 40, workers: int = 8):
+    from src.parallel_execution.threading_vs_executor import io_heavy_work, cpu_heavy_work, hybrid_work
+
+    start = perf_counter()
+
+    log("🚀 Starting per-thread resource sampling demo...")
+
+    for label, work_fn in [("IO-bound", io_heavy_work), ("CPU-bound", cpu_heavy_work), ("Hybrid", hybrid_work)]:
+        with ResourceSampler(interval=0.05) as sampler:
+            _run_threads(work_fn, num_tasks)
+        sampler.log_report(f"{label}, {num_tasks} raw threads", top=5)
+
+        with ResourceSampler(interval=0.05) as sampler:
+            _run_executor(work_fn, num_tasks, workers)
+        sampler.log_report(f"{label}, ThreadPoolExecutor({workers})", top=5)
+
+    sampler.plot("resource_usage.png")
+
+    elapsed = perf_counter() - start
+    log(f"✅ Resource sampling demo completed in {elapsed:.2f} seconds")
+
+
+if __name__ == "__main__":
+    run_demo()
@@ -0,0 +1,207 @@
+"""
+sampling_profiler.py — Continuous, low-overhead sampling profiler for all threads.
+
+Builds on the same snapshot dump_threads() uses (sys._current_frames()), but instead
+of printing one snapshot it samples every thread's stack N times per second and counts
+identical stacks.
+
+Outputs:
+- collapsed stacks ("thread;outer;...;inner count") for flamegraph.pl / speedscope,
+- a top-N "where are threads sitting" report by innermost frame,
+- the profiler's own overhead (time spent sampling vs wall time).
+
+Frames are interned: each (code, line) pair gets a small integer id once,
+so a sample is stored as a tuple of ints and counted in a dict.
+"""
+
+import os
+import random
+import threading
+from collections import Counter
+from time import perf_counter, sleep
+
+from src.diagnostics.thread_inspection import thread_frames
+from src.utils.logger import log
+
+
+class SamplingProfiler(threading.Thread):
+    """
+    Background thread sampling all other threads' stacks at `hz` samples per second.
+    """
+
+    def __init__(self, hz: float = 100.0, max_depth: int = 128):
+        super().__init__(name="SamplingProfiler", daemon=True)
+        self.interval = 1.0 / hz
+        self.max_depth = max_depth
+
+        self._frame_ids = {}        # (code, lineno) → frame id
+        self.frames = []            # frame id → (function, filename, lineno)
+        self.stack_counts = Counter()  # (thread name, (frame id, ...)) → samples
+
+        self.samples = 0
+        self.sampling_time = 0.0    # seconds spent inside _sample()
+        self._started_at = None
+        self._stopped_at = None
+        self._stop_event = threading.Event()
+
+    def _intern(self, frame) -> int:
+        key = (frame.f_code, frame.f_lineno)
+        frame_id = self._frame_ids.get(key)
+        if frame_id is None:
+            code = frame.f_code
+            frame_id = self._frame_ids[key] = len(self.frames)
+            self.frames.append((code.co_name, code.co_filename, frame.f_lineno))
+        return frame_id
+
+    def _sample(self):
+        me = threading.get_ident()
+        for thread, frame in thread_frames():
+            if frame is None or thread.ident == me:
+                continue
+            stack = []
+            depth = 0
+            while frame is not None and depth < self.max_depth:
+                stack.append(self._intern(frame))
+                frame = frame.f_back
+                depth += 1
+            stack.reverse()  # root → leaf
+            self.stack_counts[(thread.name, tuple(stack))] += 1
+        self.samples += 1
+
+    def run(self):
+        self._started_at = perf_counter()
+        while not self._stop_event.is_set():
+            t0 = perf_counter()
+            self._sample()
+            spent = perf_counter() - t0
+            self.sampling_time += spent
+            # Keep the target rate: subtract our own sampling time from the pause
+            self._stop_event.wait(max(0.0, self.interval - spent))
+        self._stopped_at = perf_counter()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _frame_label(self, frame_id: int) -> str:
+        func, filename, lineno = self.frames[frame_id]
+        return f"{func} ({os.path.basename(filename)}:{lineno})"
+
+    def collapsed(self) -> list:
+        """
+        Returns collapsed-stack lines, heaviest first: "thread;root;...;leaf count".
+        """
+        lines = []
+        for (thread_name, stack), count in self.stack_counts.most_common():
+            frames = ";".join(self._frame_label(f) for f in stack)
+            lines.append(f"{thread_name};{frames} {count}")
+        return lines
+
+    def write_collapsed(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+
+    def top_leaves(self, n: int = 10) -> list:
+        """
+        Returns [(leaf frame label, samples, share, threads), ...] — the innermost
+        Python frames threads were found in, i.e. where they block or burn CPU.
+        """
+        leaf_counts = Counter()
+        leaf_threads = {}
+        total = 0
+        for (thread_name, stack), count in self.stack_counts.items():
+            if not stack:
+                continue
+            leaf = stack[-1]
+            leaf_counts[leaf] += count
+            leaf_threads.setdefault(leaf, set()).add(thread_name)
+            total += count
+
+        return [
+            (self._frame_label(leaf), count, count / total, sorted(leaf_threads[leaf]))
+            for leaf, count in leaf_counts.most_common(n)
+        ]
+
+    def overhead(self) -> dict:
+        """
+        Reports how much the profiler itself cost.
+        """
+        end = self._stopped_at if self._stopped_at is not None else perf_counter()
+        wall = end - self._started_at if self._started_at is not None else 0.0
+        return {
+            "samples": self.samples,
+            "wall_s": wall,
+            "sampling_s": self.sampling_time,
+            "per_sample_us": self.sampling_time / self.samples * 1e6 if self.samples else 0.0,
+            "overhead_pct": self.sampling_time / wall * 100 if wall else 0.0,
+            "unique_stacks": len(self.stack_counts),
+            "interned_frames": len(self.frames),
+        }
+
+    def log_report(self, n: int = 10):
+        log(f"\n📍 Top {n} places threads were found in:")
+        for label, count, share, threads in self.top_leaves(n):
+            log(f"{share * 100:5.1f}%  {count:6d}  {label}  ← {', '.join(threads[:4])}"
+                f"{' …' if len(threads) > 4 else ''}")
+
+        o = self.overhead()
+        log(f"\n⏱️ Profiler overhead: {o['samples']} samples, {o['per_sample_us']:.1f}µs/sample, "
+            f"{o['overhead_pct']:.2f}% of {o['wall_s']:.2f}s wall "
+            f"({o['unique_stacks']} unique stacks, {o['interned_frames']} frames)")
+
+
+shared_lock = threading.Lock()
+
+
+def sleepy_worker():
+    for _ in range(10):
+        sleep(random.uniform(0.05, 0.15))
+
+
+def cpu_worker():
+    total = 0
+    for _ in range(20):
+        total += sum(x * x for x in range(50_000))
+    return total
+
+
+def lock_worker():
+    for _ in range(10):
+        with shared_lock:
+            sleep(0.05)
+
+
+def run_demo(hz: float = 200.0, path: str = "profile.collapsed"):
+    start = perf_counter()
+
+    log(f"🚀 Starting sampling profiler demo at {hz:.0f} Hz...")
+
+    threads = (
+        [threading.Thread(target=sleepy_worker, name=f"Sleeper-{i}") for i in range(2)]
+        + [threading.Thread(target=cpu_worker, name=f"Cruncher-{i}") for i in range(2)]
+        + [threading.Thread(target=lock_worker, name=f"Locker-{i}") for i in range(3)]
+    )
+
+    with SamplingProfiler(hz=hz) as profiler:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    profiler.log_report()
+    profiler.write_collapsed(path)
+    log(f"🔥 Wrote collapsed stacks to '{path}' (feed to flamegraph.pl or speedscope.app)")
+
+    elapsed = perf_counter() - start
+    log(f"✅ Sampling profiler demo completed in {elapsed:.2f} seconds")
+
+
+if __name__ == "__main__":
+    run_demo()
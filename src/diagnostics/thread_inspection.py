@@ -16,6 +16,15 @@ import sys
 import traceback
 from src.utils.logger import log
 
+def thread_frames():
+    """
+    Returns [(thread, top frame or None), ...] for every live thread.
+    One sys._current_frames() call gives a consistent snapshot of all stacks.
+    """
+    frames = sys._current_frames()
+    return [(thread, frames.get(thread.ident)) for thread in threading.enumerate()]
+
+
 def dump_threads():
     """
     Logs a dump of all currently running threads, including their call stacks.
@@ -23,11 +32,8 @@ def dump_threads():
     """
     log("\n🧵 Dumping all active threads and their call stacks...")
 
-    frames = sys._current_frames()
-
-    for thread in threading.enumerate():
+    for thread, frame in thread_frames():
         log(f"\n--- Thread: name={thread.name}, ident={thread.ident}, daemon={thread.daemon}")
-        frame = frames.get(thread.ident)
         if frame:
             for filename, lineno, func, line in traceback.extract_stack(frame):
                 log(f"  {filename}:{lineno} in {func}")
@@ -3,16 +3,20 @@ timing_threads.py — Track thread lifetimes across multiple runs by name.
 
 Each time a thread starts and finishes, we record how long it lived.
 Results are grouped and summarized by thread name (not instance).
+
+Durations go into a LatencyStats aggregator: fixed memory per name,
+lock-free per-thread recording, percentiles on read.
 """
 
 import threading
 from time import perf_counter, sleep
 import random
-from collections import defaultdict
 from src.utils.logger import log
+from src.diagnostics.latency_stats import LatencyStats
+from src.diagnostics.tracing import tracer
 
-# Grouped lifetime durations by thread name
-thread_lifetime_stats = defaultdict(list)
+# Lifetime durations by thread name, task durations under "task"
+thread_lifetime_stats = LatencyStats()
 
 
 def simulated_task():
@@ -26,7 +30,7 @@ def simulated_task():
 class TimedThread(threading.Thread):
     """
     Thread that tracks its own start and end time.
-    Lifetime is recorded into a global stats dict by name.
+    Lifetime is recorded into the global stats aggregator by name.
     """
     def __init__(self, name: str, num_tasks: int):
         super().__init__(name=name)
@@ -37,12 +41,14 @@ class TimedThread(threading.Thread):
     def run(self):
         self._start_time = perf_counter()
         log(f"{self.name} started.")
-        for _ in range(self.num_tasks):
-            simulated_task()
+        with tracer.span(self.name, cat="thread"):
+            for _ in range(self.num_tasks):
+                with thread_lifetime_stats.time("task"):
+                    simulated_task()
         self._end_time = perf_counter()
         log(f"{self.name} finished.")
         duration = self._end_time - self._start_time
-        thread_lifetime_stats[self.name].append(duration)
+        thread_lifetime_stats.record(self.name, duration)
 
 
 def run_demo():
@@ -62,10 +68,11 @@ def run_demo():
         t.join()
 
     log("\n📊 Aggregated lifetime stats by thread name:")
-    for name, durations in thread_lifetime_stats.items():
-        avg = sum(durations) / len(durations)
-        log(f"{name}: runs={len(durations)}, min={min(durations):.3f}s, "
-            f"max={max(durations):.3f}s, avg={avg:.3f}s, total={sum(durations):.2f}s")
+    for name in thread_lifetime_stats.names():
+        s = thread_lifetime_stats.summary(name)
+        log(f"{name}: runs={s['count']}, min={s['min']:.3f}s, max={s['max']:.3f}s, "
+            f"avg={s['mean']:.3f}s, p50={s['p50']:.3f}s, p99={s['p99']:.3f}s, "
+            f"total={s['total']:.2f}s, rate={s['rate']:.2f}/s")
 
     log("✅ Thread lifetime aggregation demo complete.")
 
@@ -0,0 +1,303 @@
+"""
+tracing.py — Record thread timelines and export them to Chrome Trace / Perfetto JSON.
+
+Open the exported file in https://ui.perfetto.dev or chrome://tracing to see:
+- how long each thread lived,
+- when executor tasks were submitted, started and finished (queueing delay!),
+- how long threads waited on queue put/get,
+- log() lines as instant markers on the thread that emitted them.
+
+Events are appended to per-thread buffers (no shared lock on the hot path)
+as compact tuples and only converted to JSON on export.
+"""
+
+import json
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from queue import Queue
+from time import perf_counter_ns, sleep, perf_counter
+
+from src.utils import logger
+from src.utils.logger import log
+
+# Chrome Trace Event phases
+_BEGIN, _END, _COMPLETE, _INSTANT, _COUNTER = "B", "E", "X", "i", "C"
+
+
+class Tracer:
+    """
+    Collects span / instant / counter events per thread into bounded buffers.
+
+    Each event is stored as (phase, name, category, ts_us, dur_us, args).
+    When a thread's buffer is full, further events from it are dropped and counted.
+    """
+
+    def __init__(self, max_events_per_thread: int = 200_000):
+        self.max_events_per_thread = max_events_per_thread
+        self.enabled = False
+        self._t0 = perf_counter_ns()
+        self._local = threading.local()
+        self._buffers = []          # (thread ident, thread name, event list), one per thread ever seen
+        self._buffers_lock = threading.Lock()
+        self.dropped = 0
+
+    def start(self):
+        self._t0 = perf_counter_ns()
+        with self._buffers_lock:
+            self._buffers.clear()
+            self._local = threading.local()
+            self.dropped = 0
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def now_us(self) -> float:
+        return (perf_counter_ns() - self._t0) / 1000
+
+    def _buffer(self) -> list:
+        events = getattr(self._local, "events", None)
+        if events is None:
+            # First event from this thread: register its buffer once. Appended rather
+            # than keyed by ident — CPython reuses the idents of exited threads
+            events = self._local.events = []
+            thread = threading.current_thread()
+            with self._buffers_lock:
+                self._buffers.append((thread.ident, thread.name, events))
+        return events
+
+    def _emit(self, event: tuple):
+        events = self._buffer()
+        if len(events) >= self.max_events_per_thread:
+            self.dropped += 1
+            return
+        events.append(event)
+
+    def begin(self, name: str, cat: str = "", **args):
+        if self.enabled:
+            self._emit((_BEGIN, name, cat, self.now_us(), 0, args))
+
+    def end(self, name: str, cat: str = "", **args):
+        if self.enabled:
+            self._emit((_END, name, cat, self.now_us(), 0, args))
+
+    def complete(self, name: str, start_us: float, end_us: float, cat: str = "", **args):
+        """
+        Records a whole span at once (one event instead of a begin/end pair).
+        """
+        if self.enabled:
+            self._emit((_COMPLETE, name, cat, start_us, end_us - start_us, args))
+
+    @contextmanager
+    def span(self, name: str, cat: str = "", **args):
+        if not self.enabled:
+            yield
+            return
+        start = self.now_us()
+        try:
+            yield
+        finally:
+            self.complete(name, start, self.now_us(), cat, **args)
+
+    def instant(self, name: str, cat: str = "", **args):
+        if self.enabled:
+            self._emit((_INSTANT, name, cat, self.now_us(), 0, args))
+
+    def counter(self, name: str, **values):
+        if self.enabled:
+            self._emit((_COUNTER, name, "", self.now_us(), 0, values))
+
+    def log_instant(self, message: str, fmt_args: tuple, **args):
+        """
+        Instant marker for a log() line. Like log() itself, message % fmt_args is
+        only built later — on export — not on the logging thread.
+        """
+        if self.enabled:
+            self._emit((_INSTANT, (message, fmt_args), "log", self.now_us(), 0, args))
+
+    def to_chrome_events(self) -> list:
+        """
+        Converts buffered events into Chrome Trace Event dicts.
+        """
+        pid = os.getpid()
+
+        with self._buffers_lock:
+            buffers = list(self._buffers)
+
+        out = []
+        for tid, name, events in buffers:
+            out.append({"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": name}})
+            for ph, ev_name, cat, ts, dur, args in list(events):
+                if isinstance(ev_name, tuple):
+                    ev_name = _format_log_message(*ev_name)
+                event = {"ph": ph, "name": ev_name, "pid": pid, "tid": tid, "ts": ts}
+                if cat:
+                    event["cat"] = cat
+                if ph == _COMPLETE:
+                    event["dur"] = dur
+                elif ph == _INSTANT:
+                    event["s"] = "t"
+                if args:
+                    event["args"] = args
+                out.append(event)
+        return out
+
+    def export_chrome(self, path: str) -> int:
+        """
+        Writes a Chrome Trace / Perfetto compatible JSON file. Returns the number of events.
+        """
+        events = self.to_chrome_events()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "otherData": {"dropped_events": self.dropped}}, f)
+        return len(events)
+
+
+# Process-wide tracer used by the hooks below
+tracer = Tracer()
+
+
+def _format_log_message(message: str, args: tuple) -> str:
+    if not args:
+        return message
+    try:
+        return message % args
+    except Exception:
+        return f"{message} {args!r}"
+
+
+def _log_listener(record: tuple):
+    _, _, _, prefix, message, args, _ = record
+    tracer.log_instant(message, args, prefix=prefix)
+
+
+def start_tracing(capture_logs: bool = True):
+    """
+    Clears previous events and enables the global tracer (optionally mirroring log() lines).
+    """
+    tracer.start()
+    if capture_logs:
+        logger.add_listener(_log_listener)
+
+
+def stop_tracing(path: str = None) -> int:
+    """
+    Disables the global tracer and optionally exports what was recorded.
+    """
+    tracer.stop()
+    logger.remove_listener(_log_listener)
+    if path:
+        return tracer.export_chrome(path)
+    return 0
+
+
+class TracedThread(threading.Thread):
+    """
+    Thread whose whole run() is recorded as a "thread" span.
+    """
+
+    def run(self):
+        with tracer.span(self.name, cat="thread"):
+            super().run()
+
+
+class TracedThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor that records task submit (instant) and execution (span).
+    The span carries the queueing delay between submit and start.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        if not tracer.enabled:
+            return super().submit(fn, *args, **kwargs)
+
+        task_name = getattr(fn, "__name__", "task")
+        submitted_us = tracer.now_us()
+        tracer.instant(f"submit {task_name}", cat="executor")
+
+        def traced_call():
+            start_us = tracer.now_us()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                tracer.complete(task_name, start_us, tracer.now_us(), cat="executor",
+                                queue_delay_ms=round((start_us - submitted_us) / 1000, 3))
+
+        return super().submit(traced_call)
+
+
+class TracedQueue(Queue):
+    """
+    Queue that records time spent blocked in put()/get() and the queue depth.
+    """
+
+    def __init__(self, maxsize: int = 0, name: str = "queue"):
+        super().__init__(maxsize)
+        self.name = name
+
+    def put(self, item, block=True, timeout=None):
+        start_us = tracer.now_us()
+        try:
+            super().put(item, block, timeout)
+        finally:
+            if tracer.enabled:
+                tracer.complete(f"{self.name}.put", start_us, tracer.now_us(), cat="queue")
+                tracer.counter(f"{self.name} depth", size=self.qsize())
+
+    def get(self, block=True, timeout=None):
+        start_us = tracer.now_us()
+        try:
+            return super().get(block, timeout)
+        finally:
+            if tracer.enabled:
+                tracer.complete(f"{self.name}.get", start_us, tracer.now_us(), cat="queue")
+                tracer.counter(f"{self.name} depth", size=self.qsize())
+
+
+def _producer(q: TracedQueue, n: int):
+    for i in range(n):
+        sleep(random.uniform(0.01, 0.05))
+        q.put(i)
+    q.put(None)
+
+
+def _consumer(q: TracedQueue, executor: ThreadPoolExecutor):
+    futures = []
+    while (item := q.get()) is not None:
+        futures.append(executor.submit(_process, item))
+    for fut in futures:
+        fut.result()
+
+
+def _process(item: int):
+    sleep(random.uniform(0.05, 0.2))
+    return item * 2
+
+
+def run_demo(path: str = "trace.json"):
+    start = perf_counter()
+
+    log("🚀 Starting tracing demo — producer → queue → consumer → thread pool")
+    start_tracing()
+
+    q = TracedQueue(maxsize=3, name="jobs")
+    with TracedThreadPoolExecutor(max_workers=3, thread_name_prefix="Pool") as executor:
+        producer = TracedThread(target=_producer, args=(q, 20), name="Producer")
+        consumer = TracedThread(target=_consumer, args=(q, executor), name="Consumer")
+        producer.start()
+        consumer.start()
+        producer.join()
+        consumer.join()
+
+    num_events = stop_tracing(path)
+    log(f"🗂️ Wrote {num_events} events to '{path}' (open in ui.perfetto.dev or chrome://tracing)")
+
+    elapsed = perf_counter() - start
+    log(f"✅ Tracing demo completed in {elapsed:.2f} seconds")
+
+
+if __name__ == "__main__":
+    run_demo()
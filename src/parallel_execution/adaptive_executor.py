@@ -0,0 +1,246 @@
+"""
+adaptive_executor.py — A thread pool that sizes itself.
+
+AdaptiveThreadPoolExecutor has the usual Executor API (submit / map / shutdown),
+but instead of a fixed max_workers it runs a small controller thread that, every
+control interval, looks at:
+- throughput (tasks completed per second in the last window),
+- backlog (tasks waiting in the queue),
+- how much of the workers' busy time was spent blocked vs running (wall vs CPU time),
+
+and moves the worker target up or down by hill climbing — a simplified version of
+the .NET thread pool's controller:
+- after growing: keep growing only if throughput improved, otherwise step back;
+- after shrinking: keep shrinking while throughput holds, otherwise grow again;
+- never grow without a backlog; grow in bigger steps the more tasks block (IO).
+
+Workers idle for longer than idle_timeout retire (down to min_workers), so the
+pool also shrinks when the load goes away.
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from time import perf_counter, thread_time
+
+from src.parallel_execution.threading_vs_executor import hybrid_work
+from src.utils.logger import log
+
+_SHUTDOWN = object()
+
+
+class AdaptiveThreadPoolExecutor(Executor):
+    def __init__(self, min_workers: int = 1, max_workers: int = None, initial_workers: int = None,
+                 idle_timeout: float = 5.0, control_interval: float = 0.25, tolerance: float = 0.05,
+                 thread_name_prefix: str = "Adaptive"):
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max_workers or 32 * (os.cpu_count() or 1)
+        self.idle_timeout = idle_timeout
+        self.control_interval = control_interval
+        self.tolerance = tolerance
+        self._prefix = thread_name_prefix
+
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._target = initial_workers or min(self.max_workers, max(self.min_workers, os.cpu_count() or 1))
+        self._num_workers = 0
+        self._idle = 0          # workers waiting on the queue right now
+        self._starting = 0      # spawned, not yet waiting: they will take work, but aren't idle yet
+        self._spawned = 0
+        self._threads = set()
+        self._sentinels = 0     # _SHUTDOWN items in the queue: not backlog
+        self._shutdown = False
+
+        # Controller inputs, reset every window
+        self._completed = 0
+        self._busy_wall = 0.0
+        self._busy_cpu = 0.0
+
+        # (seconds since start, target workers, throughput) per control window
+        self.history = []
+        self._started = perf_counter()
+        self._stop_controller = threading.Event()
+        self._controller = threading.Thread(target=self._control_loop, name=f"{self._prefix}-Controller",
+                                            daemon=True)
+        self._controller.start()
+
+    @property
+    def num_workers(self) -> int:
+        return self._num_workers
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            future = Future()
+            self._queue.put((future, fn, args, kwargs))
+            self._spawn_for_backlog_locked()
+        return future
+
+    def _spawn_for_backlog_locked(self):
+        """
+        Starts workers (up to the target) while queued tasks outnumber the workers
+        that are waiting for work or about to.
+        """
+        backlog = self._queue.qsize() - self._sentinels
+        while self._num_workers < self._target and backlog > self._idle + self._starting:
+            self._spawn_locked()
+
+    def _spawn_locked(self):
+        if self._shutdown:
+            return  # shutdown() already posted one sentinel per worker
+        self._num_workers += 1
+        self._starting += 1
+        self._spawned += 1
+        t = threading.Thread(target=self._worker, name=f"{self._prefix}_{self._spawned}", daemon=True)
+        self._threads.add(t)
+        t.start()
+
+    def _retire_locked(self):
+        self._num_workers -= 1
+        self._threads.discard(threading.current_thread())
+
+    def _worker(self):
+        with self._lock:
+            self._starting -= 1
+            self._idle += 1
+        while True:
+            try:
+                item = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    if self._shutdown or self._num_workers > self.min_workers:
+                        self._idle -= 1
+                        self._retire_locked()
+                        return
+                continue
+
+            with self._lock:
+                self._idle -= 1
+                if item is _SHUTDOWN:
+                    self._sentinels -= 1
+                    self._retire_locked()
+                    return
+
+            future, fn, args, kwargs = item
+            wall0, cpu0 = perf_counter(), thread_time()
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as exc:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+            del item, future
+
+            with self._lock:
+                self._completed += 1
+                self._busy_wall += perf_counter() - wall0
+                self._busy_cpu += thread_time() - cpu0
+                # Controller lowered the target: this worker leaves
+                if self._num_workers > self._target and not self._shutdown:
+                    self._retire_locked()
+                    return
+                self._idle += 1
+
+    def _control_loop(self):
+        last_time = perf_counter()
+        last_throughput = None
+        last_move = 0
+
+        while not self._stop_controller.wait(self.control_interval):
+            now = perf_counter()
+            with self._lock:
+                if self._shutdown:
+                    return
+                backlog = self._queue.qsize() - self._sentinels
+                completed = self._completed
+                # A window needs enough completions to say anything about throughput;
+                # with long tasks that takes several control intervals.
+                if backlog and completed < max(2, self._target // 2) and now - last_time < 20 * self.control_interval:
+                    self._spawn_for_backlog_locked()  # no new decision, but keep up with the current target
+                    continue
+                busy_wall, busy_cpu = self._busy_wall, self._busy_cpu
+                self._completed, self._busy_wall, self._busy_cpu = 0, 0.0, 0.0
+            throughput = completed / (now - last_time)
+            last_time = now
+            blocked = 1 - busy_cpu / busy_wall if busy_wall > 0 else 0.0
+
+            # Hill climbing: judge the previous move by its effect on throughput
+            if last_throughput is None or last_move == 0:
+                direction = 1
+            elif last_move > 0:
+                direction = 1 if throughput > last_throughput * (1 + self.tolerance) else -1
+            else:
+                direction = -1 if throughput >= last_throughput * (1 - self.tolerance) else 1
+
+            if direction > 0 and backlog == 0:
+                direction = 0   # nothing waiting → more threads can't help
+
+            with self._lock:
+                # Mostly-blocked tasks: grow proportionally (up to doubling) instead of one at a time
+                step = max(1, int(self._target * blocked)) if direction > 0 else 1
+                new_target = min(self.max_workers, max(self.min_workers, self._target + direction * step))
+                last_move = new_target - self._target
+                self._target = new_target
+                self._spawn_for_backlog_locked()
+                target = self._target
+
+            last_throughput = throughput if completed or backlog else None
+            self.history.append((now - self._started, target, throughput))
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    item[0].cancel()
+            # One sentinel per worker; queued behind any remaining work.
+            # No worker is spawned after this point, so the set only shrinks
+            for _ in range(self._num_workers):
+                self._queue.put(_SHUTDOWN)
+            self._sentinels += self._num_workers
+            threads = list(self._threads)
+        self._stop_controller.set()
+        if wait:
+            self._controller.join()
+            for t in threads:
+                t.join()
+
+
+def _throughput(executor, num_tasks: int) -> float:
+    start = perf_counter()
+    list(executor.map(hybrid_work, range(num_tasks)))
+    elapsed = perf_counter() - start
+    executor.shutdown()
+    return num_tasks / elapsed
+
+
+def run_demo(num_tasks: int = 400):
+    start = perf_counter()
+
+    log(f"🚀 Starting adaptive executor demo — {num_tasks} hybrid_work tasks")
+
+    for workers in (16, 64, 256):
+        tp = _throughput(ThreadPoolExecutor(max_workers=workers), num_tasks)
+        log(f"ThreadPoolExecutor(max_workers={workers:3d}): {tp:7.1f} tasks/s")
+
+    adaptive = AdaptiveThreadPoolExecutor(min_workers=1, max_workers=256)
+    tp = _throughput(adaptive, num_tasks)
+    log(f"AdaptiveThreadPoolExecutor:            {tp:7.1f} tasks/s (no max_workers tuning)")
+
+    log("\n📈 Worker target over time (t, workers, tasks/s):")
+    for t, target, throughput in adaptive.history[::max(1, len(adaptive.history) // 12)]:
+        log(f"t={t:5.2f}s  workers={target:3d}  throughput={throughput:7.1f}/s")
+
+    elapsed = perf_counter() - start
+    log(f"✅ Adaptive executor demo completed in {elapsed:.2f} seconds")
+
+
+if __name__ == "__main__":
+    run_demo()
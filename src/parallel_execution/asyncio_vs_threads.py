@@ -0,0 +1,151 @@
+"""
+asyncio_vs_threads.py — What does one concurrent unit cost: an OS thread or a coroutine?
+
+At 1k / 10k / 100k concurrent IO waits, for each model we measure:
+- wall time for all units to finish (each one "waits on IO" for the same delay),
+- creation cost per unit (time to create + start them all, divided by N),
+- peak RSS above the starting baseline, and that per unit.
+
+Models:
+- thread   — threading.Thread per unit, sleeping,
+- asyncio  — asyncio task per unit, awaiting asyncio.sleep,
+- hybrid   — asyncio task per unit that offloads a small CPU part via asyncio.to_thread
+             (the loop's default pool has only min(32, CPUs + 4) threads).
+
+Thread-per-unit usually hits an OS limit (threads per process, memory maps, RAM)
+somewhere between 10k and 100k — that failure is reported, not hidden.
+
+Each (model, level) runs in a fresh interpreter, so RSS left over by one
+measurement (Python rarely returns freed memory to the OS) can't skew the next.
+
+Usage:
+    python -m src.parallel_execution.asyncio_vs_threads --levels 1000 10000 100000 --json units.json
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+from time import perf_counter, sleep
+
+import psutil
+
+from src.diagnostics.resource_sampler import ResourceSampler
+from src.utils.bench import write_results
+from src.utils.logger import log
+
+
+def _cpu_part():
+    return sum(x * x for x in range(2_000))
+
+
+def run_threads(n: int, delay: float) -> dict:
+    created = []
+    start = perf_counter()
+    try:
+        for _ in range(n):
+            t = threading.Thread(target=sleep, args=(delay,), daemon=True)
+            t.start()
+            created.append(t)
+    except RuntimeError as e:  # "can't start new thread"
+        for t in created:
+            t.join()
+        return {"error": f"failed after {len(created)} threads: {e}"}
+    creation = perf_counter() - start
+
+    for t in created:
+        t.join()
+    return {"creation_s": creation, "wall_s": perf_counter() - start}
+
+
+def run_asyncio(n: int, delay: float, offload: bool = False) -> dict:
+    async def unit():
+        if offload:
+            await asyncio.to_thread(_cpu_part)
+        await asyncio.sleep(delay)
+
+    async def main():
+        start = perf_counter()
+        tasks = [asyncio.create_task(unit()) for _ in range(n)]
+        creation = perf_counter() - start
+        await asyncio.gather(*tasks)
+        return {"creation_s": creation, "wall_s": perf_counter() - start}
+
+    return asyncio.run(main())
+
+
+MODELS = {
+    "thread": run_threads,
+    "asyncio": run_asyncio,
+    "hybrid": lambda n, delay: run_asyncio(n, delay, offload=True),
+}
+
+
+def measure_model(model: str, n: int, delay: float) -> dict:
+    baseline_rss = psutil.Process().memory_info().rss
+    with ResourceSampler(interval=0.02) as sampler:
+        result = MODELS[model](n, delay)
+
+    extra_rss = max(0.0, max(sampler.rss) - baseline_rss)
+    result.update({
+        "model": model,
+        "units": n,
+        "peak_rss_mib": max(sampler.rss) / 2**20,
+        "rss_per_unit_kib": extra_rss / n / 1024,
+        "peak_os_threads": int(max(sampler.num_threads)),
+    })
+    if "creation_s" in result:
+        result["creation_us_per_unit"] = result["creation_s"] / n * 1e6
+    return result
+
+
+def measure_isolated(model: str, n: int, delay: float) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-m", __spec__.name, "--single", model, str(n), str(delay)],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        return {"model": model, "units": n, "error": lines[-1] if lines else f"exit code {proc.returncode}"}
+    return json.loads(proc.stdout)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Memory and creation cost per concurrent unit")
+    parser.add_argument("--levels", nargs="+", type=int, default=[1_000, 10_000, 100_000])
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--delay", type=float, default=1.0, help="simulated IO wait per unit (s)")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--single", nargs=3, metavar=("MODEL", "N", "DELAY"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single:
+        model, n, delay = args.single
+        print(json.dumps(measure_model(model, int(n), float(delay))))
+        return 0
+
+    log(f"🚀 Concurrency cost: models={args.models}, levels={args.levels}, delay={args.delay}s")
+
+    results = []
+    for n in args.levels:
+        log(f"\n🧪 {n:,} concurrent units")
+        for model in args.models:
+            r = measure_isolated(model, n, args.delay)
+            results.append(r)
+            if "error" in r:
+                log(f"{model:8s} ❌ {r['error']} — not viable at this level", prefix="LIMIT")
+                continue
+            log(f"{model:8s} wall={r['wall_s']:7.2f}s  create={r['creation_us_per_unit']:7.1f}µs/unit  "
+                f"peak RSS={r['peak_rss_mib']:8.1f}MiB ({r['rss_per_unit_kib']:6.1f}KiB/unit)  "
+                f"OS threads={r['peak_os_threads']}")
+
+    if args.json:
+        write_results(args.json, results, meta={"delay": args.delay})
+        log(f"💾 Saved results to '{args.json}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,8 @@ This is critical for real applications where:
 - exception details are retrievable from the future object.
 
 NEVER ignore Future.result().
+
+Here the other tasks keep running after one fails; task_group.py cancels them instead.
 """
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
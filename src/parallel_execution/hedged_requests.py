@@ -0,0 +1,198 @@
+"""
+hedged_requests.py — Cutting tail latency by asking a second replica.
+
+With replicated backends, a few slow responses (GC pauses, queueing, a busy disk)
+dominate p99. Hedging trades a little extra load for a much shorter tail:
+- send the request to one replica,
+- if it hasn't answered within the hedge delay — the p95 of recent response
+  times — send a backup to the next replica,
+- take whichever succeeds first and cancel the others.
+
+Only ~5% of requests get hedged, so extra load stays around 5%, while a request
+that drew a slow replica now finishes in roughly "hedge delay + a normal response".
+
+Replicas are callables replica(request, cancel_event). cancel_event is set when
+another attempt already won: well-behaved replicas check it and stop early, and
+not-yet-started attempts are simply cancelled. HedgedCaller.stats() reports how much
+extra work hedging caused.
+"""
+
+import random
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from time import perf_counter, perf_counter_ns
+
+from src.diagnostics.latency_stats import LatencyHistogram
+from src.utils.logger import log
+
+
+class HedgedCaller:
+    def __init__(self, executor, replicas: list, hedge_percentile: float = 95, max_hedges: int = 1,
+                 min_samples: int = 50, initial_delay: float = 0.05):
+        self.executor = executor
+        self.replicas = replicas
+        self.hedge_percentile = hedge_percentile
+        self.max_hedges = min(max_hedges, len(replicas) - 1)
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+
+        self._latencies = LatencyHistogram()
+        self._lock = threading.Lock()
+        self._next = 0
+        self.counters = {"requests": 0, "attempts": 0, "hedges": 0, "hedge_wins": 0,
+                         "retries": 0, "cancelled_before_start": 0, "aborted_in_flight": 0}
+
+    def hedge_delay(self) -> float:
+        """
+        Seconds to wait before hedging: the configured percentile of observed latencies.
+        """
+        with self._lock:
+            if self._latencies.count < self.min_samples:
+                return self.initial_delay
+            return self._latencies.percentile(self.hedge_percentile) / 1e9
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] += n
+
+    def _attempt(self, replica, request, cancel_event, record: bool):
+        start = perf_counter_ns()
+        try:
+            return replica(request, cancel_event)
+        finally:
+            # Attempts cut short by cancellation still record how long they ran,
+            # a lower bound that keeps slow replicas visible in the percentile
+            if record:
+                with self._lock:
+                    self._latencies.record(perf_counter_ns() - start)
+
+    def call(self, request):
+        """
+        Returns the first successful response; raises the last error if every attempt failed.
+        """
+        with self._lock:
+            self.counters["requests"] += 1
+            first = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+        order = [self.replicas[(first + i) % len(self.replicas)] for i in range(len(self.replicas))]
+
+        cancel_event = threading.Event()
+        pending = set()
+        hedge_futures = set()
+        last_error = None
+
+        def launch(replica, hedge: bool):
+            future = self.executor.submit(self._attempt, replica, request, cancel_event, record=not hedge)
+            pending.add(future)
+            if hedge:
+                hedge_futures.add(future)
+            self._count("attempts")
+
+        launch(order.pop(0), hedge=False)
+        delay = self.hedge_delay()
+        hedges = 0
+        try:
+            while pending:
+                can_hedge = order and hedges < self.max_hedges
+                done, _ = wait(pending, timeout=delay if can_hedge else None, return_when=FIRST_COMPLETED)
+                if not done:
+                    launch(order.pop(0), hedge=True)
+                    hedges += 1
+                    self._count("hedges")
+                    continue
+                for future in done:
+                    pending.discard(future)
+                    if future.exception() is None:
+                        if future in hedge_futures:
+                            self._count("hedge_wins")
+                        return future.result()
+                    last_error = future.exception()
+                if not pending and order:
+                    launch(order.pop(0), hedge=False)  # failed fast: retry elsewhere right away
+                    self._count("retries")
+            raise last_error
+        finally:
+            cancel_event.set()
+            for future in pending:
+                self._count("cancelled_before_start" if future.cancel() else "aborted_in_flight")
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.counters)
+        requests = stats["requests"] or 1
+        stats["extra_load"] = stats["attempts"] / requests - 1
+        stats["hedge_rate"] = stats["hedges"] / requests
+        return stats
+
+
+class SimulatedReplica:
+    """
+    Heavy-tailed latency: mostly lognormal around `median`, but with probability
+    `stall_prob` a Pareto-distributed stall (GC pause, queueing behind a big request).
+    """
+
+    def __init__(self, name: str, median: float = 0.01, sigma: float = 0.3,
+                 stall_prob: float = 0.03, stall_scale: float = 0.1, seed: int = 0):
+        self.name = name
+        self.median = median
+        self.sigma = sigma
+        self.stall_prob = stall_prob
+        self.stall_scale = stall_scale
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def latency(self) -> float:
+        with self._rng_lock:
+            base = self.median * self._rng.lognormvariate(0, self.sigma)
+            if self._rng.random() < self.stall_prob:
+                base += self.stall_scale * self._rng.paretovariate(1.5)
+        return base
+
+    def __call__(self, request, cancel_event: threading.Event):
+        if cancel_event.wait(self.latency()):
+            return None  # another attempt won; stop working
+        return f"{self.name}:{request}"
+
+
+def _run_load(caller, num_requests: int, clients: int) -> LatencyHistogram:
+    latencies = LatencyHistogram()
+    lock = threading.Lock()
+
+    def client_call(i):
+        start = perf_counter_ns()
+        caller.call(i)
+        elapsed = perf_counter_ns() - start
+        with lock:
+            latencies.record(elapsed)
+
+    with ThreadPoolExecutor(max_workers=clients, thread_name_prefix="Client") as clients_pool:
+        list(clients_pool.map(client_call, range(num_requests)))
+    return latencies
+
+
+def run_demo(num_requests: int = 2000, clients: int = 16):
+    start = perf_counter()
+
+    log(f"🚀 Starting hedged requests demo — {num_requests} requests, {clients} concurrent clients, 3 replicas")
+
+    configs = [("no hedging", {"max_hedges": 0}),
+               ("hedge at p95", {"hedge_percentile": 95}),
+               ("hedge at p90", {"hedge_percentile": 90})]
+    for label, kwargs in configs:
+        replicas = [SimulatedReplica(f"replica-{i}", seed=i) for i in range(3)]
+        with ThreadPoolExecutor(max_workers=clients * 3, thread_name_prefix="Backend") as backend_pool:
+            caller = HedgedCaller(backend_pool, replicas, **kwargs)
+            latencies = _run_load(caller, num_requests, clients)
+        stats = caller.stats()
+        pct = {p: latencies.percentile(p) / 1e6 for p in (50, 90, 99, 99.9)}
+        log(f"{label:14s} p50={pct[50]:6.1f}ms p90={pct[90]:6.1f}ms p99={pct[99]:7.1f}ms "
+            f"p99.9={pct[99.9]:7.1f}ms max={latencies.max / 1e6:7.1f}ms | "
+            f"extra load {stats['extra_load']:6.1%}, hedge wins {stats['hedge_wins']}/{stats['hedges']}, "
+            f"aborted {stats['aborted_in_flight']}, never started {stats['cancelled_before_start']}")
+
+    elapsed = perf_counter() - start
+    log(f"✅ Hedged requests demo completed in {elapsed:.2f} seconds")
+
+
+if __name__ == "__main__":
+    run_demo()
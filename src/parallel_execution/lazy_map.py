@@ -0,0 +1,117 @@
+"""
+lazy_map.py — A streaming map() for thread pools.
+
+ThreadPoolExecutor.map() walks the whole input up front, creating one Future per
+item (its chunksize argument only matters for ProcessPoolExecutor). Over a
+multi-million-item generator that means millions of Futures in memory before the
+first result comes back.
+
+lazy_map(executor, fn, iterable):
+- pulls items from the iterable only as capacity frees up,
+- keeps at most max_in_flight tasks submitted at any time,
+- groups chunksize items into one task (one Future per chunk, not per item),
+- yields results in input order (ordered=True) or as chunks finish (ordered=False,
+  lower latency — one slow chunk doesn't hold back the rest).
+
+Memory stays flat no matter how long the input is. If the consumer stops early or
+a task raises, pending chunks are cancelled.
+"""
+
+import os
+import tracemalloc
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from time import perf_counter
+
+from src.utils.logger import log
+
+
+def _run_chunk(fn, chunk: list) -> list:
+    return [fn(item) for item in chunk]
+
+
+def lazy_map(executor, fn, iterable, *, max_in_flight: int = None, chunksize: int = 1, ordered: bool = True):
+    """
+    Generator over fn(item) for every item, computed on executor with bounded look-ahead.
+    """
+    # Checked here, not inside the generator, so bad arguments fail at the call
+    if chunksize < 1:
+        raise ValueError("chunksize must be >= 1")
+    if max_in_flight is None:
+        max_in_flight = 2 * (os.cpu_count() or 1)
+    elif max_in_flight < 1:
+        raise ValueError("max_in_flight must be >= 1")
+    return _lazy_map(executor, fn, iter(iterable), max_in_flight, chunksize, ordered)
+
+
+def _lazy_map(executor, fn, items, max_in_flight: int, chunksize: int, ordered: bool):
+
+    def submit_next():
+        chunk = list(islice(items, chunksize))
+        return executor.submit(_run_chunk, fn, chunk) if chunk else None
+
+    pending = deque() if ordered else set()
+    add = pending.append if ordered else pending.add
+    try:
+        for _ in range(max_in_flight):
+            future = submit_next()
+            if future is None:
+                break
+            add(future)
+
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending.difference_update(done)
+
+            for future in done:
+                results = future.result()
+                # Refill before yielding, so workers stay busy while the consumer works
+                refill = submit_next()
+                if refill is not None:
+                    add(refill)
+                yield from results
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+def _measure(label: str, run):
+    tracemalloc.start()
+    start = perf_counter()
+    total = run()
+    elapsed = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    log(f"{label:38s} {elapsed:6.2f}s  peak traced memory {peak / 2**20:8.1f} MiB  (sum={total})")
+
+
+def run_demo(num_items: int = 200_000):
+    start = perf_counter()
+
+    log(f"🚀 Starting lazy_map demo — {num_items:,} items from a generator")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        _measure("executor.map (eager, 1 Future/item)",
+                 lambda: sum(executor.map(square, (i for i in range(num_items)))))
+        _measure("lazy_map chunksize=1",
+                 lambda: sum(lazy_map(executor, square, (i for i in range(num_items)))))
+        _measure("lazy_map chunksize=1000, ordered",
+                 lambda: sum(lazy_map(executor, square, (i for i in range(num_items)), chunksize=1000)))
+        _measure("lazy_map chunksize=1000, unordered",
+                 lambda: sum(lazy_map(executor, square, (i for i in range(num_items)), chunksize=1000,
+                                      ordered=False)))
+
+    elapsed = perf_counter() - start
+    log(f"✅ lazy_map demo completed in {elapsed:.2f} seconds")
+
+
+if __name__ == "__main__":
+    run_demo()
@@ -1,60 +1,198 @@
 #!/usr/bin/env python3
 """
-run_all_demos.py — Read, print and execute every Python demo in this folder.
+run_all_demos.py — Run every demo in src/ concurrently, skipping unchanged ones.
 
-For each .py file (except this one):
-  • Prints a header and the file’s contents (raw, preserving formatting)
-  • Executes it with the same interpreter
-  • Prints its stdout and stderr under a divider
+- Discovers demos in every package under src/: modules with an
+  `if __name__ == "__main__":` block. CLI benchmarks (modules using argparse)
+  run for minutes and are left out unless --all is given.
+- Runs each one as `python -m src.<package>.<module>` in its own temp directory
+  (so written artifacts don't collide or litter the repo), at most --jobs at a
+  time, each killed after --timeout seconds.
+- Caches passing results in .demo_cache.json, keyed by a hash of the demo's source
+  plus every src/ module it imports (transitively) and the interpreter version:
+  a demo is only re-run when something it depends on changed.
+- Prints a summary with status and wall time per demo; exits non-zero on failures.
+
+Usage:
+    python -m src.parallel_execution.run_all_demos                  # changed demos only
+    python -m src.parallel_execution.run_all_demos --no-cache --jobs 8
+    python -m src.parallel_execution.run_all_demos lock event --show-output
 """
 
+import argparse
+import ast
+import hashlib
+import json
 import os
-import sys
-import glob
 import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from time import perf_counter
+
+from src.utils.logger import log
 
-def main():
-    # Name of this script, so we can skip it
-    this = os.path.basename(__file__)
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+CACHE_PATH = ROOT / ".demo_cache.json"
+THIS = Path(__file__).resolve()
 
-    # Find all .py files in current directory
-    py_files = sorted(glob.glob("*.py"))
 
-    for fname in py_files:
-        if fname == this:
+def module_name(path: Path) -> str:
+    return ".".join(path.relative_to(ROOT).with_suffix("").parts)
+
+
+def discover(include_benchmarks: bool = False) -> list:
+    demos = []
+    for path in sorted(SRC.rglob("*.py")):
+        if path.resolve() == THIS or "__pycache__" in path.parts:
+            continue
+        source = path.read_text(encoding="utf-8")
+        if '__name__ == "__main__"' not in source:
+            continue
+        if "argparse" in source and not include_benchmarks:
             continue
+        demos.append(path)
+    return demos
+
+
+def _local_imports(path: Path) -> list:
+    """
+    src/ modules imported by this file (by path).
+    """
+    found = []
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+        if isinstance(node, ast.ImportFrom) and node.module and node.module.split(".")[0] == "src":
+            names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+        elif isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names if alias.name.split(".")[0] == "src"]
+        else:
+            continue
+        for name in names:
+            candidate = ROOT.joinpath(*name.split(".")).with_suffix(".py")
+            if candidate.exists():
+                found.append(candidate)
+    return found
+
+
+def source_hash(path: Path) -> str:
+    """
+    Hash of the demo and all src/ modules it depends on, plus the interpreter version.
+    """
+    seen, stack = set(), [path]
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        stack.extend(_local_imports(current))
+
+    digest = hashlib.sha256(sys.version.encode())
+    for dep in sorted(seen):
+        digest.update(str(dep.relative_to(ROOT)).encode())
+        digest.update(dep.read_bytes())
+    return digest.hexdigest()
+
+
+def load_cache() -> dict:
+    try:
+        return json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache: dict):
+    tmp = CACHE_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, CACHE_PATH)
+
+
+def _partial_output(output) -> str:
+    # TimeoutExpired carries bytes on POSIX even with text=True
+    if isinstance(output, bytes):
+        return output.decode(errors="replace")
+    return output or ""
+
+
+def run_demo_process(module: str, timeout: float) -> dict:
+    # Prepend, don't replace: dependencies may only be reachable through the caller's PYTHONPATH
+    pythonpath = os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")]))
+    env = dict(os.environ, PYTHONPATH=pythonpath, MPLBACKEND="Agg")
+    start = perf_counter()
+    with tempfile.TemporaryDirectory(prefix="demo-") as workdir:
+        try:
+            proc = subprocess.run([sys.executable, "-m", module], cwd=workdir, env=env,
+                                  capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired as e:
+            return {"status": "TIMEOUT", "wall": perf_counter() - start,
+                    "stdout": _partial_output(e.stdout), "stderr": _partial_output(e.stderr)}
+    status = "ok" if proc.returncode == 0 else f"FAIL ({proc.returncode})"
+    return {"status": status, "wall": perf_counter() - start, "stdout": proc.stdout, "stderr": proc.stderr}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run all demos concurrently with result caching")
+    parser.add_argument("names", nargs="*", help="only demos whose module name contains one of these")
+    parser.add_argument("--jobs", type=int, default=max(4, os.cpu_count() or 1), help="demos running at once")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds before a demo is killed")
+    parser.add_argument("--no-cache", action="store_true", help="run everything, ignore cached results")
+    parser.add_argument("--all", action="store_true", help="include CLI benchmarks (slow)")
+    parser.add_argument("--show-output", action="store_true", help="print each demo's output")
+    args = parser.parse_args(argv)
+
+    demos = discover(args.all)
+    if args.names:
+        demos = [p for p in demos if any(n in module_name(p) for n in args.names)]
+    cache = {} if args.no_cache else load_cache()
+
+    to_run, rows = [], []
+    for path in demos:
+        module, key = module_name(path), source_hash(path)
+        cached = cache.get(module)
+        if cached and cached["hash"] == key:
+            rows.append((module, "cached", cached["wall"]))
+        else:
+            to_run.append((module, key))
+
+    log(f"🚀 {len(demos)} demos: {len(to_run)} to run, {len(rows)} unchanged (cached); "
+        f"jobs={args.jobs}, timeout={args.timeout:.0f}s")
+
+    start = perf_counter()
+    failed = 0
+    with ThreadPoolExecutor(max_workers=args.jobs, thread_name_prefix="DemoRunner") as executor:
+        futures = {executor.submit(run_demo_process, module, args.timeout): (module, key) for module, key in to_run}
+        for future in as_completed(futures):
+            module, key = futures[future]
+            result = future.result()
+            rows.append((module, result["status"], result["wall"]))
+            if result["status"] == "ok":
+                cache[module] = {"hash": key, "wall": result["wall"]}
+                log(f"✅ {module} ({result['wall']:.1f}s)")
+            else:
+                failed += 1
+                cache.pop(module, None)
+                log(f"❌ {module}: {result['status']} after {result['wall']:.1f}s", prefix="ERROR")
+                if not args.show_output:
+                    tail = result["stderr"].strip().splitlines()[-5:]
+                    for line in tail:
+                        log(f"    {line}", prefix="ERROR")
+            if args.show_output:
+                print(f"\n{'-' * 80}\nOUTPUT of {module}\n{'-' * 80}")
+                print(result["stdout"], end="")
+                if result["stderr"]:
+                    print(f"\n{'!' * 20} STDERR {'!' * 20}\n{result['stderr']}")
+    wall = perf_counter() - start
+    save_cache(cache)
+
+    log("\n📋 Summary (slowest first):")
+    for module, status, seconds in sorted(rows, key=lambda r: -r[2]):
+        log(f"{module:55s} {status:10s} {seconds:7.2f}s")
+    ran = sum(s for _, status, s in rows if status != "cached")
+    log(f"Ran {len(to_run)} demos in {wall:.1f}s wall ({ran:.1f}s of demo time); {failed} failed, "
+        f"{len(rows) - len(to_run)} skipped as unchanged")
+    return 1 if failed else 0
 
-        # Section header
-        print("\n" + "="*80)
-        print(f"FILE: {fname}")
-        print("="*80 + "\n")
-
-        # Print source code
-        with open(fname, "r", encoding="utf-8") as f:
-            code = f.read()
-        print(code)
-
-        # Divider before output
-        print("\n" + "-"*80)
-        print(f"OUTPUT of {fname}")
-        print("-"*80 + "\n")
-
-        # Execute the script, capture output
-        proc = subprocess.run(
-            [sys.executable, fname],
-            capture_output=True,
-            text=True
-        )
-
-        # Print stdout
-        if proc.stdout:
-            print(proc.stdout, end="")
-
-        # Print stderr (if any) under a warning
-        if proc.stderr:
-            print("\n" + "!"*20 + " ERRORS " + "!"*20)
-            print(proc.stderr)
-            print("!"*53 + "\n")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""
+scaling_sweep.py — How does each workload scale with the number of pool workers?
+
+For every workload (IO, CPU, hybrid from threading_vs_executor.py) the sweep runs
+the same batch of tasks with 1, 2, 4, ... up to several × CPU-count workers and records:
+- throughput (tasks/s) and speedup over 1 worker,
+- per-task latency percentiles (submit → done, so queueing is included),
+- peak RSS and context switches (via ResourceSampler) — of this process only, so
+  with --backend process-pool they leave out the worker processes.
+
+Speedups are then fitted to two models:
+- Amdahl:  S(N) = N / (1 + σ(N-1))               σ = serial fraction → ceiling 1/σ
+- USL:     S(N) = N / (1 + σ(N-1) + κN(N-1))      κ = coherency cost → peak at √((1-σ)/κ)
+
+The report says where each workload stops scaling and suggests a pool size:
+the smallest worker count reaching 90% of the best measured throughput.
+
+Usage:
+    python -m src.parallel_execution.scaling_sweep --workloads io cpu hybrid --tasks 64
+    python -m src.parallel_execution.scaling_sweep --backend process-pool --workloads cpu --json sweep.json
+"""
+
+import argparse
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from time import perf_counter_ns
+
+from src.diagnostics.latency_stats import LatencyHistogram
+from src.diagnostics.resource_sampler import ResourceSampler
+from src.parallel_execution import threading_vs_executor as tve
+from src.parallel_execution.threading_vs_executor import WORKLOADS, set_seed
+from src.utils.bench import int_at_least, summarize, write_results
+from src.utils.logger import log
+
+EXECUTORS = {
+    "executor": ThreadPoolExecutor,
+    "process-pool": ProcessPoolExecutor,
+}
+
+
+class TaskFailed(Exception):
+    """
+    A task of the sweep raised; the original exception is the __cause__.
+    """
+
+
+def worker_counts(max_factor: int = 4) -> list:
+    """
+    Powers of two from 1 up to max_factor × CPU count (inclusive of the last power).
+    """
+    limit = max_factor * (os.cpu_count() or 1)
+    counts = [1]
+    while counts[-1] * 2 <= limit:
+        counts.append(counts[-1] * 2)
+    return counts
+
+
+def run_point(executor_cls, work_fn, num_tasks: int, workers: int) -> dict:
+    """
+    Runs num_tasks tasks on `workers` workers once; returns wall time and latency histogram.
+    A task that raised re-raises here: a failed run is not a data point.
+    """
+    latencies = LatencyHistogram()
+    latencies_lock = threading.Lock()  # done-callbacks run on the pool's threads
+
+    def record_latency(submit_ns):
+        elapsed = perf_counter_ns() - submit_ns
+        with latencies_lock:
+            latencies.record(elapsed)
+
+    kwargs = {"initializer": set_seed, "initargs": (tve.SEED,)} if executor_cls is ProcessPoolExecutor else {}
+
+    futures = []
+    start = perf_counter_ns()
+    with executor_cls(max_workers=workers, **kwargs) as executor:
+        for i in range(num_tasks):
+            submit_ns = perf_counter_ns()
+            future = executor.submit(work_fn, i)
+            future.add_done_callback(lambda _, t=submit_ns: record_latency(t))
+            futures.append(future)
+    wall = (perf_counter_ns() - start) / 1e9
+    for i, future in enumerate(futures):
+        exc = future.exception()
+        if exc is not None:
+            raise TaskFailed(f"task {i} raised {exc!r}") from exc
+    return {"wall": wall, "latencies": latencies}
+
+
+def fit_usl(points: list) -> dict:
+    """
+    Least-squares fit of USL (and Amdahl as κ = 0) to [(N, speedup), ...].
+
+    Linearized: N/S - 1 = σ·(N-1) + κ·N(N-1), solved via the 2×2 normal equations.
+    """
+    xs = [(n - 1, n * (n - 1), n / s - 1) for n, s in points if s > 0]
+    sxx = sum(a * a for a, _, _ in xs)
+    sxy = sum(a * b for a, b, _ in xs)
+    syy = sum(b * b for _, b, _ in xs)
+    sxz = sum(a * z for a, _, z in xs)
+    syz = sum(b * z for _, b, z in xs)
+
+    amdahl_sigma = min(1.0, max(0.0, sxz / sxx)) if sxx else 0.0  # a serial fraction: 0..1
+
+    det = sxx * syy - sxy * sxy
+    if det:
+        sigma = (sxz * syy - syz * sxy) / det
+        kappa = (sxx * syz - sxy * sxz) / det
+    else:
+        sigma, kappa = amdahl_sigma, 0.0
+    if kappa < 1e-9:
+        # No measurable retrograde behaviour → USL degenerates to Amdahl
+        sigma, kappa = amdahl_sigma, 0.0
+    sigma = max(0.0, sigma)
+
+    peak = ((1 - sigma) / kappa) ** 0.5 if kappa > 0 and sigma < 1 else None
+    return {
+        "amdahl_sigma": amdahl_sigma,
+        "amdahl_max_speedup": 1 / amdahl_sigma if amdahl_sigma > 0 else None,
+        "usl_sigma": sigma,
+        "usl_kappa": kappa,
+        "usl_peak_workers": peak,
+    }
+
+
+def usl_speedup(n: float, sigma: float, kappa: float) -> float:
+    return n / (1 + sigma * (n - 1) + kappa * n * (n - 1))
+
+
+def sweep_workload(workload_name: str, backend: str, num_tasks: int, counts: list, repeats: int) -> dict:
+    workload = WORKLOADS[workload_name]
+    executor_cls = EXECUTORS[backend]
+    # ResourceSampler sees this process only: with a process pool that is just the parent
+    scope = "parent" if executor_cls is ProcessPoolExecutor else "process"
+    scope_label = "parent-only " if scope == "parent" else ""
+    log(f"\n📐 Scaling sweep: {workload.description} on {backend}, {num_tasks} tasks")
+
+    points = []
+    for workers in counts:
+        walls = []
+        latencies = LatencyHistogram()
+        with ResourceSampler(interval=0.05) as sampler:
+            for _ in range(repeats):
+                result = run_point(executor_cls, workload.fn, num_tasks, workers)
+                walls.append(result["wall"])
+                latencies.merge(result["latencies"])
+
+        stats = summarize(walls)
+        point = {
+            "workers": workers,
+            "wall": stats["mean"],
+            "wall_ci95": stats["ci95"],
+            "throughput": num_tasks / stats["mean"],
+            "latency_p50": latencies.percentile(50) / 1e9,
+            "latency_p99": latencies.percentile(99) / 1e9,
+            "peak_rss_mib": max(sampler.rss) / 2**20,
+            "ctx_switches": int(sampler.ctx_voluntary[-1] - sampler.ctx_voluntary[0]
+                                + sampler.ctx_involuntary[-1] - sampler.ctx_involuntary[0]),
+            "resource_scope": scope,
+        }
+        point["speedup"] = point["throughput"] / points[0]["throughput"] if points else 1.0
+        points.append(point)
+        log(f"N={workers:4d}  {point['throughput']:8.1f} tasks/s  ×{point['speedup']:5.2f}  "
+            f"p50={point['latency_p50'] * 1000:8.1f}ms p99={point['latency_p99'] * 1000:8.1f}ms  "
+            f"{scope_label}RSS={point['peak_rss_mib']:6.1f}MiB  ctx={point['ctx_switches']}")
+
+    fit = fit_usl([(p["workers"], p["speedup"]) for p in points])
+    best = max(p["throughput"] for p in points)
+    recommended = next(p["workers"] for p in points if p["throughput"] >= 0.9 * best)
+
+    amdahl_cap = f"×{fit['amdahl_max_speedup']:.1f}" if fit["amdahl_max_speedup"] else "unbounded"
+    peak = f"N≈{fit['usl_peak_workers']:.0f}" if fit["usl_peak_workers"] else "none in sight"
+    log(f"Amdahl σ={fit['amdahl_sigma']:.4f} (max speedup {amdahl_cap}); "
+        f"USL σ={fit['usl_sigma']:.4f} κ={fit['usl_kappa']:.6f} (throughput peak {peak})")
+    log(f"👉 Recommended pool size for {workload_name}: {recommended} workers "
+        f"(≥90% of best measured throughput)", prefix="SIZING")
+
+    return {"workload": workload_name, "backend": backend, "tasks": num_tasks,
+            "points": points, "fit": fit, "recommended_workers": recommended}
+
+
+def plot_sweeps(sweeps: list, path: str):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(8, 5))
+    for sweep in sweeps:
+        ns = [p["workers"] for p in sweep["points"]]
+        line, = plt.plot(ns, [p["speedup"] for p in sweep["points"]], "o", label=f"{sweep['workload']} measured")
+        fit = sweep["fit"]
+        dense = [1 + i * (ns[-1] - 1) / 100 for i in range(101)]
+        plt.plot(dense, [usl_speedup(n, fit["usl_sigma"], fit["usl_kappa"]) for n in dense],
+                 "-", color=line.get_color(), alpha=0.6, label=f"{sweep['workload']} USL fit")
+
+    plt.xscale("log", base=2)
+    plt.xlabel("Workers")
+    plt.ylabel("Speedup vs 1 worker")
+    plt.title("Scaling by worker count")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(path, dpi=150)
+    log(f"🖼️ Saved scaling chart as '{path}'")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Worker-count scaling sweep with Amdahl/USL fits")
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=["io", "cpu", "hybrid"])
+    parser.add_argument("--backend", choices=list(EXECUTORS), default="executor")
+    parser.add_argument("--tasks", type=int_at_least(1), default=64)
+    parser.add_argument("--max-factor", type=int, default=4, help="sweep up to this × CPU count workers")
+    parser.add_argument("--repeats", type=int_at_least(1), default=1)
+    parser.add_argument("--seed", type=int, default=tve.SEED)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--plot", help="save speedup curves to this file")
+    args = parser.parse_args(argv)
+
+    set_seed(args.seed)
+    counts = worker_counts(args.max_factor)
+    log(f"🚀 Sweeping workers {counts} (CPU count: {os.cpu_count()})")
+
+    sweeps, failed = [], []
+    for workload_name in args.workloads:
+        if not WORKLOADS[workload_name].available():
+            log(f"{workload_name} skipped — missing optional dependency", prefix="SKIP")
+            continue
+        try:
+            sweeps.append(sweep_workload(workload_name, args.backend, args.tasks, counts, args.repeats))
+        except TaskFailed as exc:
+            log(f"{workload_name} failed — {exc}; no sizing advice", prefix="ERROR")
+            failed.append(workload_name)
+
+    if args.json:
+        write_results(args.json, sweeps, meta={"seed": args.seed, "repeats": args.repeats, "counts": counts})
+        log(f"💾 Saved sweep to '{args.json}'")
+    if args.plot:
+        plot_sweeps(sweeps, args.plot)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+task_group.py — Structured concurrency for threads: fail fast, cancel the rest.
+
+In exceptions_in_threads.py a failing task doesn't stop its siblings: they all run
+to completion and the error only surfaces at the end. TaskGroup changes that:
+
+    with TaskGroup(timeout=5) as group:
+        for item in batch:
+            group.submit(process, item)
+    # ← leaves only when every task is done; errors are raised as an ExceptionGroup
+
+- the first failure cancels the group: queued tasks never start, and running
+  tasks see it through their CancelToken (current_token()) and stop early,
+- all real errors are collected into one ExceptionGroup (Cancelled is not an error),
+- a per-group timeout sets a deadline; when it passes the group is cancelled and
+  a TimeoutError is reported,
+- groups nest: a group opened inside a task is a child of that task's group,
+  inherits its deadline and is cancelled along with it.
+
+Cancellation is cooperative — Python can't interrupt a running thread — so long
+tasks should call token.raise_if_cancelled() or token.sleep() now and then.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from time import monotonic, perf_counter, sleep
+
+from src.utils.logger import log
+
+_DEADLINE = "deadline exceeded"
+_current = threading.local()
+
+
+class Cancelled(Exception):
+    """
+    Raised inside a task whose group was cancelled.
+    """
+
+
+class CancelToken:
+    def __init__(self, parent: "CancelToken" = None, deadline: float = None):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._children = []
+        self.reason = None
+        self.parent = parent
+        if parent is not None and parent.deadline is not None:
+            deadline = parent.deadline if deadline is None else min(deadline, parent.deadline)
+        self.deadline = deadline
+        if parent is not None:
+            parent._add_child(self)
+
+    def _add_child(self, child: "CancelToken"):
+        with self._lock:
+            self._children.append(child)
+            reason = self.reason if self._event.is_set() else None
+        if reason is not None:
+            child.cancel(reason)
+
+    def _remove_child(self, child: "CancelToken"):
+        with self._lock:
+            self._children.remove(child)
+
+    def cancel(self, reason: str = "cancelled"):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            children = list(self._children)
+        for child in children:
+            child.cancel(reason)
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self.deadline is not None and monotonic() >= self.deadline:
+            self.cancel(_DEADLINE)
+            return True
+        return False
+
+    def remaining(self) -> float:
+        return None if self.deadline is None else max(0.0, self.deadline - monotonic())
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise Cancelled(self.reason)
+
+    def sleep(self, seconds: float):
+        """
+        Like time.sleep, but wakes up (raising Cancelled) as soon as the token is cancelled.
+        """
+        remaining = self.remaining()
+        if self._event.wait(seconds if remaining is None else min(seconds, remaining)) or self.cancelled:
+            raise Cancelled(self.reason)
+
+
+def current_token() -> CancelToken:
+    """
+    Token of the TaskGroup task running on this thread (None outside a group).
+    """
+    return getattr(_current, "token", None)
+
+
+class TaskGroup:
+    def __init__(self, executor=None, *, timeout: float = None, max_workers: int = None, name: str = "TaskGroup"):
+        self.name = name
+        self.timeout = timeout
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        self._futures = []
+        self._errors = []
+        self.token = None
+        self._owns_deadline = False
+
+    def __enter__(self):
+        deadline = monotonic() + self.timeout if self.timeout is not None else None
+        self.token = CancelToken(current_token(), deadline)
+        # Only the group whose own timeout set the deadline reports TimeoutError;
+        # nested groups that inherited it are simply cancelled
+        self._owns_deadline = deadline is not None and self.token.deadline == deadline
+        if self._owns_executor:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix=self.name)
+        return self
+
+    def submit(self, fn, /, *args, **kwargs):
+        self.token.raise_if_cancelled()
+        future = self._executor.submit(self._run, fn, args, kwargs)
+        with self._lock:
+            self._futures.append(future)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _run(self, fn, args, kwargs):
+        self.token.raise_if_cancelled()  # cancelled while queued: don't start
+        previous = current_token()
+        _current.token = self.token
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.token = previous
+
+    def _on_done(self, future):
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None and not isinstance(exc, Cancelled):
+            with self._lock:
+                self._errors.append(exc)
+            self.cancel(f"sibling failed: {exc!r}")
+
+    def cancel(self, reason: str = "cancelled by caller"):
+        self.token.cancel(reason)
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None and not isinstance(exc, Cancelled):
+            self.cancel(f"group body raised {exc!r}")
+        try:
+            while True:
+                with self._lock:
+                    pending = [f for f in self._futures if not f.done()]
+                if not pending:
+                    break
+                _, not_done = wait(pending, timeout=None if self.token.cancelled else self.token.remaining())
+                if not_done and self.token.cancelled:
+                    self.cancel(self.token.reason)  # deadline passed while waiting
+        finally:
+            if self._owns_executor:
+                self._executor.shutdown(wait=True)
+            if self.token.parent is not None:
+                self.token.parent._remove_child(self.token)
+
+        errors = list(self._errors)
+        if self.token.reason == _DEADLINE and self._owns_deadline:
+            errors.append(TimeoutError(f"{self.name} exceeded its {self.timeout}s deadline"))
+        if exc is not None and not isinstance(exc, Cancelled):
+            errors.append(exc)
+        if errors:
+            raise ExceptionGroup(f"{self.name}: {len(errors)} task(s) failed", errors)
+        if self.token.parent is not None and self.token.parent.cancelled:
+            raise Cancelled(self.token.parent.reason)  # stop the enclosing task too
+        return exc_type is Cancelled
+
+
+def step_task(task_id: int, steps: int = 10, fail_at: int = None) -> int:
+    """
+    Works in small steps, checking the group's token between them.
+    """
+    token = current_token()
+    for step in range(steps):
+        if task_id == fail_at and step == 3:
+            raise ValueError(f"Task-{task_id} failed at step {step} 💥")
+        token.sleep(0.1)
+    return task_id
+
+
+def _plain_batch(num_tasks: int, fail_at: int):
+    def plain_task(task_id):
+        for step in range(10):
+            if task_id == fail_at and step == 3:
+                raise ValueError(f"Task-{task_id} failed")
+            sleep(0.1)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(plain_task, i) for i in range(num_tasks)]
+    return [f.exception() for f in futures if f.exception()]
+
+
+def run_demo(num_tasks: int = 12):
+    start = perf_counter()
+
+    log(f"🚀 Starting TaskGroup demo — {num_tasks} tasks, 4 workers, Task-1 fails")
+
+    t0 = perf_counter()
+    errors = _plain_batch(num_tasks, fail_at=1)
+    log(f"Plain ThreadPoolExecutor: {len(errors)} error after {perf_counter() - t0:.2f}s (all siblings ran to the end)")
+
+    t0 = perf_counter()
+    try:
+        with TaskGroup(max_workers=4, name="Batch") as group:
+            for i in range(num_tasks):
+                group.submit(step_task, i, fail_at=1)
+    except ExceptionGroup as eg:
+        log(f"TaskGroup: {eg.exceptions!r} after {perf_counter() - t0:.2f}s (siblings cancelled)", prefix="ERROR")
+
+    t0 = perf_counter()
+    try:
+        with TaskGroup(max_workers=2, timeout=0.5, name="Outer") as outer:
+            def nested(i):
+                with TaskGroup(max_workers=2, name=f"Inner-{i}") as inner:
+                    inner.submit(step_task, i * 10)
+                    inner.submit(step_task, i * 10 + 1)
+            outer.submit(nested, 1)
+            outer.submit(nested, 2)
+    except ExceptionGroup as eg:
+        log(f"Nested groups with 0.5s deadline: {eg.exceptions!r} after {perf_counter() - t0:.2f}s",
+            prefix="ERROR")
+
+    elapsed = perf_counter() - start
+    log(f"✅ TaskGroup demo completed in {elapsed:.2f} seconds")
+
+
+if __name__ == "__main__":
+    run_demo()
@@ -4,45 +4,166 @@ threading_vs_executor.py — Compares raw threading vs ThreadPoolExecutor on dif
 Workloads:
 - IO-bound (sleep),
 - CPU-bound (sum of squares),
-- Hybrid (math + sleep).
-
-Generates a timing comparison bar chart.
+- Hybrid (math + sleep),
+- hash / zlib / numpy — GIL-releasing work on mmap'd chunks (gil_releasing_workloads.py).
+
+Backends:
+- threads / executor — threading.Thread per task vs ThreadPoolExecutor (default),
+- serial — plain loop in the main thread (speedup baseline),
+- lazy-map — ThreadPoolExecutor fed by lazy_map: bounded in-flight, chunked (lazy_map.py),
+- process-pool — ProcessPoolExecutor with chunked map (real CPU parallelism),
+- interpreters — InterpreterPoolExecutor, one GIL per subinterpreter (Python 3.14+),
+- free-threaded — ThreadPoolExecutor sized to the CPU count, only when the GIL is disabled,
+- asyncio / asyncio-to-thread — one coroutine per task on an event loop (IO + hybrid only);
+  the -to-thread variant offloads the CPU part of hybrid work via asyncio.to_thread.
+Unavailable backends are skipped. `--backends all` runs every available one.
+
+Each (workload, backend) pair is run with warmup and repeats; results are reported
+as mean ± 95% confidence interval, optionally saved as JSON and plotted.
+
+Usage:
+    python -m src.parallel_execution.threading_vs_executor                  # all workloads, chart
+    python -m src.parallel_execution.threading_vs_executor run --headless \\
+        --workloads io cpu --tasks 200 --workers 16 --repeats 5 --json results.json
+    python -m src.parallel_execution.threading_vs_executor run --headless \\
+        --workloads cpu --backends all --overhead
+    python -m src.parallel_execution.threading_vs_executor compare base.json results.json
 """
 
-import threading
-from concurrent.futures import ThreadPoolExecutor
+import argparse
+import asyncio
+import concurrent.futures
+import os
 import random
-from time import sleep, perf_counter
-import matplotlib.pyplot as plt
+import sys
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from time import sleep
 
+from src.parallel_execution import gil_releasing_workloads
+from src.parallel_execution.lazy_map import lazy_map
+from src.utils.bench import compare_results, gil_enabled, int_at_least, measure, read_results, summarize, write_results
 from src.utils.logger import log
 
 NUM_TASKS = 1500
 WORKER_DELAY = (0.3, 0.5)
 
+# Seed for the per-task random delays; same seed → same delays in every run
+SEED = 0
+
+Workload = namedtuple("Workload", "name fn description available", defaults=(lambda: True,))
+Backend = namedtuple("Backend", "name run description available supports")
+
+WORKLOADS = {}
+BACKENDS = {}
+DEFAULT_BACKENDS = ["threads", "executor"]
+
+
+def register_workload(name: str, description: str, available=lambda: True):
+    """
+    Decorator: makes work_fn(task_id) selectable as --workloads <name>.
+    """
+    def decorator(fn):
+        WORKLOADS[name] = Workload(name, fn, description, available)
+        return fn
+    return decorator
+
+
+def register_backend(name: str, description: str, available=lambda: True, supports=lambda work_fn: True):
+    """
+    Decorator: makes run(work_fn, num_tasks, workers) selectable as --backends <name>.
+    available() is checked before running; unavailable backends are skipped,
+    and so are workloads for which supports(work_fn) is False.
+    """
+    def decorator(run):
+        BACKENDS[name] = Backend(name, run, description, available, supports)
+        return run
+    return decorator
+
+
+def set_seed(seed: int):
+    global SEED
+    SEED = seed
+
+
+def task_delay(task_id: int) -> float:
+    """
+    Deterministic pseudo-random delay for a task, independent of thread scheduling.
+    """
+    return round(random.Random(SEED * 1_000_003 + task_id).uniform(*WORKER_DELAY), 2)
 
+
+@register_workload("io", "IO-bound (sleep)")
 def io_heavy_work(task_id: int):
-    sleep_time = round(random.uniform(*WORKER_DELAY), 2)
+    sleep_time = task_delay(task_id)
     sleep(sleep_time)
     return sleep_time
 
 
+@register_workload("cpu", "CPU-bound (sum)")
 def cpu_heavy_work(task_id: int):
     total = sum(x ** 2 for x in range(100_000))
     return total
 
 
+@register_workload("hybrid", "Hybrid (math + sleep)")
 def hybrid_work(task_id: int):
     total = sum(x ** 2 for x in range(100_000))
-    sleep(round(random.uniform(*WORKER_DELAY), 2))
+    sleep(task_delay(task_id))
     return total
 
 
-def run_with_threads(work_fn):
-    start = perf_counter()
+def _cpu_part():
+    return sum(x ** 2 for x in range(100_000))
+
+
+async def async_io_heavy_work(task_id: int):
+    sleep_time = task_delay(task_id)
+    await asyncio.sleep(sleep_time)
+    return sleep_time
+
+
+async def async_hybrid_work(task_id: int):
+    # CPU part runs on the event loop thread and blocks every other coroutine meanwhile
+    total = _cpu_part()
+    await asyncio.sleep(task_delay(task_id))
+    return total
+
+
+async def async_hybrid_offload_work(task_id: int):
+    total = await asyncio.to_thread(_cpu_part)
+    await asyncio.sleep(task_delay(task_id))
+    return total
+
+
+# Coroutine equivalents of the sync workloads, per asyncio backend
+ASYNC_VARIANTS = {io_heavy_work: async_io_heavy_work, hybrid_work: async_hybrid_work}
+OFFLOAD_VARIANTS = {io_heavy_work: async_io_heavy_work, hybrid_work: async_hybrid_offload_work}
+
+
+@register_workload("noop", "Empty task (scheduling / serialization overhead)")
+def noop_work(task_id: int):
+    return task_id
+
+
+register_workload("hash", "sha256 of mmap'd chunks (GIL released)")(gil_releasing_workloads.hash_chunk)
+register_workload("zlib", "zlib.compress of mmap'd chunks (GIL released)")(gil_releasing_workloads.compress_chunk)
+register_workload("numpy", "NumPy sqrt+sum over mmap'd chunks (GIL released)",
+                  gil_releasing_workloads.numpy_available)(gil_releasing_workloads.numpy_reduce_chunk)
+
+
+@register_backend("serial", "Serial loop (baseline)")
+def run_serial(work_fn, num_tasks: int = NUM_TASKS, workers: int = None):
+    for i in range(num_tasks):
+        work_fn(i)
+
+
+@register_backend("threads", "threading.Thread per task")
+def run_with_threads(work_fn, num_tasks: int = NUM_TASKS, workers: int = None):
     threads = []
 
-    for i in range(NUM_TASKS):
+    for i in range(num_tasks):
         t = threading.Thread(target=work_fn, args=(i,))
         t.start()
         threads.append(t)
@@ -50,59 +171,260 @@ def run_with_threads(work_fn):
     for t in threads:
         t.join()
 
-    return perf_counter() - start
 
+@register_backend("executor", "ThreadPoolExecutor")
+def run_with_executor(work_fn, num_tasks: int = NUM_TASKS, workers: int = None):
+    with ThreadPoolExecutor(max_workers=workers or num_tasks) as executor:
+        list(executor.map(work_fn, range(num_tasks)))
+
+
+def _pool_chunksize(num_tasks: int, workers: int) -> int:
+    # ~4 chunks per worker: few enough to amortize pickling/IPC, enough to balance load
+    return max(1, num_tasks // (workers * 4))
+
+
+@register_backend("lazy-map", "ThreadPoolExecutor + lazy_map (chunked)")
+def run_with_lazy_map(work_fn, num_tasks: int = NUM_TASKS, workers: int = None):
+    workers = workers or num_tasks
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in lazy_map(executor, work_fn, range(num_tasks), max_in_flight=2 * workers,
+                          chunksize=_pool_chunksize(num_tasks, workers)):
+            pass
+
+
+@register_backend("process-pool", "ProcessPoolExecutor (chunked)")
+def run_with_process_pool(work_fn, num_tasks: int = NUM_TASKS, workers: int = None):
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers, initializer=set_seed, initargs=(SEED,)) as executor:
+        list(executor.map(work_fn, range(num_tasks), chunksize=_pool_chunksize(num_tasks, workers)))
+
+
+def _interpreters_available() -> bool:
+    return hasattr(concurrent.futures, "InterpreterPoolExecutor")
 
-def run_with_executor(work_fn):
-    start = perf_counter()
-    with ThreadPoolExecutor(max_workers=NUM_TASKS) as executor:
-        list(executor.map(work_fn, range(NUM_TASKS)))
-    return perf_counter() - start
 
+@register_backend("interpreters", "InterpreterPoolExecutor (per-interpreter GIL)", _interpreters_available)
+def run_with_interpreters(work_fn, num_tasks: int = NUM_TASKS, workers: int = None):
+    workers = workers or os.cpu_count()
+    with concurrent.futures.InterpreterPoolExecutor(max_workers=workers, initializer=set_seed,
+                                                    initargs=(SEED,)) as executor:
+        list(executor.map(work_fn, range(num_tasks), chunksize=_pool_chunksize(num_tasks, workers)))
+
+
+@register_backend("free-threaded", "ThreadPoolExecutor, GIL disabled", lambda: not gil_enabled())
+def run_free_threaded(work_fn, num_tasks: int = NUM_TASKS, workers: int = None):
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        list(executor.map(work_fn, range(num_tasks)))
 
-def benchmark(label, work_fn):
-    log(f"\n🧪 Benchmarking: {label}")
-    t_thread = run_with_threads(work_fn)
-    log(f"🧵 threading.Thread time: {t_thread:.2f}s")
 
-    t_pool = run_with_executor(work_fn)
-    log(f"⚙️ ThreadPoolExecutor time: {t_pool:.2f}s")
+async def _gather(coro_fn, num_tasks: int, limit: int = None):
+    if limit is None:
+        await asyncio.gather(*(coro_fn(i) for i in range(num_tasks)))
+        return
 
-    return t_thread, t_pool
+    semaphore = asyncio.Semaphore(limit)
 
+    async def limited(i):
+        async with semaphore:
+            return await coro_fn(i)
 
-def plot_all(results):
-    labels = list(results.keys())
-    thread_times = [v[0] for v in results.values()]
-    pool_times = [v[1] for v in results.values()]
+    await asyncio.gather(*(limited(i) for i in range(num_tasks)))
+
+
+@register_backend("asyncio", "asyncio, one coroutine per task", supports=lambda fn: fn in ASYNC_VARIANTS)
+def run_with_asyncio(work_fn, num_tasks: int = NUM_TASKS, workers: int = None):
+    # workers, if given, caps the number of coroutines in flight
+    asyncio.run(_gather(ASYNC_VARIANTS[work_fn], num_tasks, workers))
+
+
+@register_backend("asyncio-to-thread", "asyncio + to_thread for CPU parts",
+                  supports=lambda fn: fn in OFFLOAD_VARIANTS)
+def run_with_asyncio_offload(work_fn, num_tasks: int = NUM_TASKS, workers: int = None):
+    asyncio.run(_gather(OFFLOAD_VARIANTS[work_fn], num_tasks, workers))
+
+
+def backend_overhead(backend: Backend, workers: int, repeats: int = 3) -> dict:
+    """
+    Fits time(noop × n) = startup + n × per_task from two task counts:
+    startup ≈ pool creation + worker spin-up, per_task ≈ dispatch + serialization.
+    """
+    workers = workers or os.cpu_count()
+    small, large = workers, workers * 50
+    t_small = summarize(measure(lambda: backend.run(noop_work, small, workers), repeats=repeats))["mean"]
+    t_large = summarize(measure(lambda: backend.run(noop_work, large, workers), repeats=repeats))["mean"]
+    per_task = max(0.0, (t_large - t_small) / (large - small))
+    return {"startup_s": max(0.0, t_small - per_task * small), "per_task_us": per_task * 1e6}
+
+
+def benchmark(workload: Workload, backend: Backend, num_tasks: int, workers: int,
+              warmup: int, repeats: int) -> dict:
+    samples = measure(lambda: backend.run(workload.fn, num_tasks, workers),
+                      warmup=warmup, repeats=repeats)
+    stats = summarize(samples)
+    log(f"{backend.name:17s} {workload.name:8s} {stats['mean']:7.3f}s ± {stats['ci95']:.3f}s "
+        f"(stdev {stats['stdev']:.3f}s, n={stats['n']})")
+    return {"workload": workload.name, "backend": backend.name, "tasks": num_tasks,
+            "workers": workers, "samples": samples, **stats}
+
+
+def run_benchmarks(workload_names, backend_names, num_tasks: int, workers: int,
+                   warmup: int, repeats: int) -> list:
+    results = []
+    for workload_name in workload_names:
+        workload = WORKLOADS[workload_name]
+        if not workload.available():
+            log(f"{workload.name} skipped — missing optional dependency", prefix="SKIP")
+            continue
+        log(f"\n🧪 Benchmarking: {workload.description}")
+        for backend_name in backend_names:
+            backend = BACKENDS[backend_name]
+            if not backend.available():
+                log(f"{backend.name:17s} skipped — not available on this interpreter", prefix="SKIP")
+                continue
+            if not backend.supports(workload.fn):
+                log(f"{backend.name:17s} skipped — no variant of this workload", prefix="SKIP")
+                continue
+            results.append(benchmark(workload, backend, num_tasks, workers, warmup, repeats))
+        log_speedups([r for r in results if r["workload"] == workload_name])
+    return results
+
+
+def log_speedups(results: list):
+    """
+    Logs each backend's speedup over the serial baseline, if it was measured.
+    """
+    serial = next((r for r in results if r["backend"] == "serial"), None)
+    if serial is None:
+        return
+    for r in results:
+        if r is not serial:
+            r["speedup"] = serial["mean"] / r["mean"] if r["mean"] else 0.0
+            log(f"{r['backend']:17s} speedup vs serial: ×{r['speedup']:.2f}")
+
+
+def plot_all(results, path: str = "threading_vs_executor.png", show: bool = True):
+    import matplotlib
+    if not show:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    labels = list(dict.fromkeys(r["workload"] for r in results))
+    backends = list(dict.fromkeys(r["backend"] for r in results))
+    by_key = {(r["workload"], r["backend"]): r for r in results}
 
     x = range(len(labels))
-    width = 0.35
+    width = 0.8 / len(backends)
 
     plt.figure(figsize=(8, 5))
-    plt.bar([i - width / 2 for i in x], thread_times, width=width, label='threading.Thread')
-    plt.bar([i + width / 2 for i in x], pool_times, width=width, label='ThreadPoolExecutor')
-
-    plt.ylabel("Total Time (s)")
-    plt.title("Performance: threading vs ThreadPoolExecutor")
+    for b, backend in enumerate(backends):
+        offset = (b - (len(backends) - 1) / 2) * width
+        means = [by_key[(w, backend)]["mean"] if (w, backend) in by_key else 0 for w in labels]
+        errors = [by_key[(w, backend)]["ci95"] if (w, backend) in by_key else 0 for w in labels]
+        plt.bar([i + offset for i in x], means, width=width, yerr=errors, capsize=4,
+                label=BACKENDS[backend].description)
+
+    plt.ylabel("Total Time (s), mean ± 95% CI")
+    plt.title("Performance by execution backend")
     plt.xticks(ticks=x, labels=labels)
     plt.legend()
     plt.tight_layout()
 
     # Show and save
-    plt.savefig("threading_vs_executor.png", dpi=150)
-    log("🖼️ Saved plot as 'threading_vs_executor.png'")
-    plt.show()
-
-
-def run_all_benchmarks():
-    results = {
-        "IO-bound": benchmark("IO-bound (sleep)", io_heavy_work),
-        "CPU-bound": benchmark("CPU-bound (sum)", cpu_heavy_work),
-        "Hybrid": benchmark("Hybrid (math + sleep)", hybrid_work),
-    }
-    plot_all(results)
+    plt.savefig(path, dpi=150)
+    log(f"🖼️ Saved plot as '{path}'")
+    if show:
+        plt.show()
+
+
+def cmd_run(args) -> int:
+    if args.backends == ["all"]:
+        args.backends = list(BACKENDS)
+    unknown = [w for w in args.workloads if w not in WORKLOADS] + [b for b in args.backends if b not in BACKENDS]
+    if unknown:
+        log(f"Unknown workload/backend: {', '.join(unknown)}", prefix="ERROR")
+        return 2
+
+    set_seed(args.seed)
+    log(f"🚀 {len(args.workloads)} workloads × {len(args.backends)} backends, tasks={args.tasks}, "
+        f"workers={args.workers or args.tasks}, warmup={args.warmup}, repeats={args.repeats}, seed={args.seed}")
+    results = run_benchmarks(args.workloads, args.backends, args.tasks, args.workers,
+                             args.warmup, args.repeats)
+
+    overhead = {}
+    if args.overhead:
+        log("\n⏱️ Backend overhead (noop tasks):")
+        for name in args.backends:
+            backend = BACKENDS[name]
+            if backend.available() and backend.supports(noop_work):
+                overhead[name] = backend_overhead(backend, args.workers)
+                log(f"{name:17s} startup {overhead[name]['startup_s'] * 1000:8.2f}ms, "
+                    f"per task {overhead[name]['per_task_us']:8.1f}µs")
+
+    if args.json:
+        write_results(args.json, results, meta={"seed": args.seed, "warmup": args.warmup,
+                                                "repeats": args.repeats, "overhead": overhead})
+        log(f"💾 Saved results to '{args.json}'")
+    if args.plot or not args.headless:
+        plot_all(results, args.plot or "threading_vs_executor.png", show=not args.headless)
+    return 0
+
+
+def cmd_compare(args) -> int:
+    rows = compare_results(read_results(args.baseline), read_results(args.current),
+                           key_fields=("workload", "backend", "tasks", "workers"),
+                           threshold=args.threshold)
+    icons = {"regression": "🔴", "improvement": "🟢", "same": "⚪", "new": "🆕"}
+    for row in rows:
+        label = "/".join(str(k) for k in row["key"])
+        if row["baseline"] is None:
+            log(f"{icons['new']} {label}: {row['current']:.3f}s (no baseline)")
+        else:
+            log(f"{icons[row['status']]} {label}: {row['baseline']:.3f}s → {row['current']:.3f}s "
+                f"({row['change'] * 100:+.1f}%) {row['status']}")
+
+    regressions = sum(row["status"] == "regression" for row in rows)
+    if regressions:
+        log(f"{regressions} regression(s) above {args.threshold * 100:.0f}%", prefix="FAIL")
+        return 1
+    log("✅ No regressions")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="threading.Thread vs ThreadPoolExecutor benchmarks")
+    sub = parser.add_subparsers(dest="command")
+
+    run = sub.add_parser("run", help="run benchmarks")
+    run.add_argument("--workloads", nargs="+", default=["io", "cpu", "hybrid"], help=f"any of {list(WORKLOADS)}")
+    run.add_argument("--backends", nargs="+", default=DEFAULT_BACKENDS,
+                     help=f"any of {list(BACKENDS)}, or 'all'")
+    run.add_argument("--tasks", type=int, default=NUM_TASKS)
+    run.add_argument("--workers", type=int, default=None, help="pool size (default: one per task)")
+    run.add_argument("--warmup", type=int_at_least(0), default=1)
+    run.add_argument("--repeats", type=int_at_least(1), default=3)
+    run.add_argument("--seed", type=int, default=SEED)
+    run.add_argument("--json", help="write machine-readable results to this file")
+    run.add_argument("--plot", help="save the chart to this file")
+    run.add_argument("--headless", action="store_true", help="never open a plot window")
+    run.add_argument("--overhead", action="store_true", help="also measure startup / per-task overhead")
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare", help="flag regressions between two result files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.05, help="relative slowdown to flag")
+    compare.set_defaults(func=cmd_compare)
+    return parser
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    # `run` is the default sub-command
+    if not argv or argv[0].startswith("-"):
+        argv = ["run", *argv]
+    args = build_parser().parse_args(argv)
+    return args.func(args)
 
 
 if __name__ == "__main__":
-    run_all_benchmarks()
+    sys.exit(main())
@@ -7,6 +7,7 @@ This pattern:
 - is perfect for fast-response-first scenarios (e.g. querying mirrors, scraping).
 
 This is how you handle futures when order doesn’t matter.
+To take only the first answer from several mirrors and cancel the rest, see hedged_requests.py.
 """
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
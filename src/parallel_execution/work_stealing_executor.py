@@ -0,0 +1,266 @@
+"""
+work_stealing_executor.py — One deque per worker instead of one shared queue.
+
+ThreadPoolExecutor pushes every submission through a single queue.SimpleQueue
+that all workers contend on. WorkStealingExecutor gives each worker its own deque:
+- tasks submitted from inside a worker go to that worker's deque (subtasks stay local),
+- a worker pops its own deque LIFO (newest first — hot in cache, depth-first),
+- an idle worker steals FIFO from the other end of a victim's deque (oldest —
+  usually the biggest piece of a recursive split),
+- tasks submitted from outside go to a shared injection deque.
+
+collections.deque append/pop/popleft are atomic, so the fast path takes no lock at
+all; a Condition is only touched to park idle workers and wake them up.
+
+For fork/join, a task that waits on its subtasks should use executor.join(future):
+instead of blocking the worker it keeps running queued tasks until the future is
+done. (Blocking in Future.result() inside a bounded pool can deadlock — that is
+why the fork/join benchmark has no ThreadPoolExecutor column.)
+
+Usage:
+    python -m src.parallel_execution.work_stealing_executor --workers 4 --json ws.json
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+
+from src.utils.bench import gil_enabled, measure, summarize, write_results
+from src.utils.logger import log
+
+_SPIN_ROUNDS = 64
+_PARK_TIMEOUT = 0.05
+
+
+class WorkStealingExecutor(Executor):
+    def __init__(self, max_workers: int = None, thread_name_prefix: str = "Stealer"):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._deques = [deque() for _ in range(self.max_workers)]
+        self._injector = deque()
+        self._local = threading.local()
+        self._cv = threading.Condition(threading.Lock())
+        self._sleepers = 0
+        self._shutdown = False
+        self.steals = 0  # unsynchronized stat: may undercount without the GIL
+
+        self._threads = [
+            threading.Thread(target=self._worker, args=(i,), name=f"{thread_name_prefix}_{i}", daemon=True)
+            for i in range(self.max_workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        if self._shutdown:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        future = Future()
+        index = getattr(self._local, "index", None)
+        target = self._injector if index is None else self._deques[index]
+        target.append((future, fn, args, kwargs))
+        if self._sleepers:
+            with self._cv:
+                self._cv.notify()
+        return future
+
+    def join(self, future: Future):
+        """
+        Waits for future; from inside a worker, runs other queued tasks meanwhile.
+        """
+        index = getattr(self._local, "index", None)
+        if index is None:
+            return future.result()
+        while not future.done():
+            item = self._find_work(index)
+            if item is None:
+                wait([future], timeout=0.001)  # nothing to help with (e.g. it was stolen): brief wait
+                continue
+            self._run(item)
+        return future.result()
+
+    def _find_work(self, index: int):
+        try:
+            return self._deques[index].pop()        # own deque: LIFO
+        except IndexError:
+            pass
+        try:
+            return self._injector.popleft()          # external submissions: FIFO
+        except IndexError:
+            pass
+        n = self.max_workers
+        start = random.randrange(n)
+        for k in range(n):
+            victim = (start + k) % n
+            if victim == index:
+                continue
+            try:
+                item = self._deques[victim].popleft()  # steal the oldest: FIFO
+            except IndexError:
+                continue
+            self.steals += 1
+            return item
+        return None
+
+    def _has_work(self) -> bool:
+        return bool(self._injector) or any(self._deques)
+
+    @staticmethod
+    def _run(item):
+        future, fn, args, kwargs = item
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    def _worker(self, index: int):
+        self._local.index = index
+        idle_rounds = 0
+        while True:
+            item = self._find_work(index)
+            if item is not None:
+                idle_rounds = 0
+                self._run(item)
+                continue
+            if self._shutdown:
+                return
+            idle_rounds += 1
+            if idle_rounds < _SPIN_ROUNDS:
+                continue
+            with self._cv:
+                # Announce ourselves before the final check, so a concurrent
+                # submit either sees the sleeper or we see its task.
+                self._sleepers += 1
+                if not self._has_work() and not self._shutdown:
+                    self._cv.wait(_PARK_TIMEOUT)
+                self._sleepers -= 1
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        self._shutdown = True
+        if cancel_futures:
+            for d in [self._injector, *self._deques]:
+                while True:
+                    try:
+                        d.popleft()[0].cancel()
+                    except IndexError:
+                        break
+        with self._cv:
+            self._cv.notify_all()
+        if wait:
+            for t in self._threads:
+                t.join()
+
+
+# ── Benchmark workloads ─────────────────────────────────────────────────────
+
+
+def tiny_task(x: int) -> int:
+    return x + 1
+
+
+def fine_grained(executor, num_tasks: int):
+    """
+    Many tiny tasks submitted from outside: pure scheduling overhead.
+    """
+    futures = [executor.submit(tiny_task, i) for i in range(num_tasks)]
+    for f in futures:
+        f.result()
+
+
+def spawn_tree(executor, depth: int, fanout: int):
+    """
+    Recursive spawning: every task submits `fanout` children until `depth`.
+    Nobody blocks on children, so this also runs on ThreadPoolExecutor;
+    completion is tracked with a countdown.
+    """
+    total = sum(fanout ** d for d in range(depth + 1))
+    remaining = [total]
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def node(level):
+        if level < depth:
+            for _ in range(fanout):
+                executor.submit(node, level + 1)
+        with lock:
+            remaining[0] -= 1
+            if not remaining[0]:
+                done.set()
+
+    executor.submit(node, 0)
+    done.wait()
+
+
+def fib(executor: WorkStealingExecutor, n: int, cutoff: int = 10) -> int:
+    """
+    Fork/join: split into two subtasks, fork one, compute the other inline, join.
+    """
+    if n <= cutoff:
+        a, b = 0, 1
+        for _ in range(n):
+            a, b = b, a + b
+        return a
+    left = executor.submit(fib, executor, n - 1, cutoff)
+    right = fib(executor, n - 2, cutoff)
+    return executor.join(left) + right
+
+
+def _bench(label: str, executor_factory, fn, warmup: int, repeats: int) -> dict:
+    executor = executor_factory()
+    try:
+        samples = measure(lambda: fn(executor), warmup=warmup, repeats=repeats)
+    finally:
+        executor.shutdown()
+    stats = summarize(samples)
+    extra = f"  steals={executor.steals}" if isinstance(executor, WorkStealingExecutor) else ""
+    log(f"{label:28s} {stats['mean'] * 1000:9.2f} ms ± {stats['ci95'] * 1000:6.2f}{extra}")
+    return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Work-stealing executor vs ThreadPoolExecutor")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--tasks", type=int, default=20_000, help="tasks in the fine-grained workload")
+    parser.add_argument("--depth", type=int, default=7, help="depth of the spawn tree (fanout 4)")
+    parser.add_argument("--fib", type=int, default=27, help="n for the fork/join fib workload")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    build = "GIL" if gil_enabled() else "free-threaded (GIL disabled)"
+    log(f"🚀 Work-stealing benchmark: {args.workers} workers, {build} build")
+
+    executors = {
+        "ThreadPoolExecutor": lambda: ThreadPoolExecutor(max_workers=args.workers),
+        "WorkStealingExecutor": lambda: WorkStealingExecutor(max_workers=args.workers),
+    }
+    workloads = [
+        ("fine-grained", lambda ex: fine_grained(ex, args.tasks), list(executors)),
+        ("spawn-tree", lambda ex: spawn_tree(ex, args.depth, 4), list(executors)),
+        ("fork/join fib", lambda ex: ex.submit(fib, ex, args.fib).result(), ["WorkStealingExecutor"]),
+    ]
+
+    results = []
+    for workload, fn, names in workloads:
+        log(f"\n🧪 {workload}")
+        for name in names:
+            stats = _bench(name, executors[name], fn, args.warmup, args.repeats)
+            results.append({"workload": workload, "executor": name, "workers": args.workers, **stats})
+        if len(names) == 1:
+            log("ThreadPoolExecutor           n/a — blocking joins deadlock a bounded pool", prefix="SKIP")
+
+    if args.json:
+        write_results(args.json, results, meta={"gil_enabled": gil_enabled()})
+        log(f"💾 Saved results to '{args.json}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
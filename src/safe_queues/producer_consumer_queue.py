@@ -33,10 +33,10 @@ def producer(producer_id: int):
 def consumer(consumer_id: int):
     while True:
         item = q.get()  # blocks if empty
-        log(f"Consumer {consumer_id} got {item}")
+        log("Consumer %d got %s", consumer_id, item)
         sleep(random.uniform(0.2, 0.5))  # simulate processing
         q.task_done()
-        log(f"Consumer {consumer_id} finished {item}")
+        log("Consumer %d finished %s", consumer_id, item)
 
 
 def run_producer_consumer_demo():
@@ -2,11 +2,13 @@
 lock_demo.py — Demonstrates race conditions and how Lock solves them.
 
 This script shows how multiple threads can corrupt shared state
-when no synchronization is used, and how `threading.Lock` prevents this.
+when no synchronization is used, and how `threading.Lock` prevents this —
+or, for counters, how a sharded per-thread counter avoids the lock entirely.
 """
 
 import threading
 from time import sleep
+from src.synchronization.sharded_accumulator import ShardedCounter
 from src.utils.logger import log
 
 # Shared resource (dangerous to mutate concurrently)
@@ -17,6 +19,9 @@ NUM_THREADS = 6  # Increased to provoke race conditions more reliably
 # Create a lock for synchronization
 lock = threading.Lock()
 
+# Per-thread slots, summed on read — no lock per increment
+sharded_counter = ShardedCounter()
+
 
 def increment_unsafely():
     """
@@ -43,12 +48,22 @@ def increment_safely():
             counter += 1
 
 
-def run_demo(target_func, description: str):
+def increment_sharded():
+    """
+    Increments the thread's own slot of a ShardedCounter.
+    Correct without a lock, because no two threads write the same slot.
+    """
+    for _ in range(NUM_ITERATIONS):
+        sharded_counter.add()
+
+
+def run_demo(target_func, description: str, read_counter=lambda: counter):
     """
     Runs the demo with multiple threads using the provided target function.
 
     :param target_func: Function to execute in each thread.
     :param description: Description to log before running.
+    :param read_counter: Returns the final count once all threads are done.
     """
     global counter
     counter = 0
@@ -65,11 +80,12 @@ def run_demo(target_func, description: str):
         thread.join()
 
     expected = NUM_ITERATIONS * NUM_THREADS
+    actual = read_counter()
 
     log(f"Expected counter: {expected}")
-    log(f"Actual counter:   {counter}")
+    log(f"Actual counter:   {actual}")
 
-    if counter != expected:
+    if actual != expected:
         log("❌ Race condition occurred! Shared state was corrupted.", prefix="ERROR")
     else:
         log("✅ Counter is correct. Synchronization successful.", prefix="OK")
@@ -79,3 +95,4 @@ def run_demo(target_func, description: str):
 if __name__ == "__main__":
     run_demo(increment_unsafely, "Unsafe Increment (No Lock)")
     run_demo(increment_safely, "Safe Increment (With Lock)")
+    run_demo(increment_sharded, "Sharded Increment (No Lock, Per-Thread Slots)", sharded_counter.value)
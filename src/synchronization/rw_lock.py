@@ -0,0 +1,269 @@
+"""
+rw_lock.py — Reader-writer lock: many readers at once, writers alone.
+
+With a plain Lock, readers of read-mostly state serialize behind each other even
+though they never conflict. RWLock lets any number of readers hold it together,
+and gives writers exclusive access. Who goes first when both wait is the policy:
+- "reader"     — readers enter whenever no writer holds the lock (best read
+                 throughput; a steady stream of readers can starve writers),
+- "writer"     — a waiting writer blocks new readers (writers never starve,
+                 readers can),
+- "phase-fair" — read and write phases alternate: readers arriving while a writer
+                 waits go in right after that writer, before the next one; neither
+                 side starves, and each waits at most one phase of the other.
+
+Also: timeouts on every acquire, upgrade() from read to write (one upgrader at a
+time) and downgrade() from write to read, and wait-time histograms per side.
+
+Not reentrant: a thread must not acquire the lock it already holds.
+
+Usage (benchmark vs a plain Lock):
+    python -m src.synchronization.rw_lock --threads 16 --mixes 0.9 0.99 --json rwlock.json
+"""
+
+import argparse
+import random
+import sys
+import threading
+from contextlib import contextmanager
+from time import perf_counter, perf_counter_ns, sleep
+
+from src.diagnostics.latency_stats import LatencyStats
+from src.utils.bench import gil_enabled, summarize, write_results
+from src.utils.logger import log
+
+POLICIES = ("reader", "writer", "phase-fair")
+
+
+class RWLock:
+    def __init__(self, policy: str = "phase-fair"):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy {policy!r}, expected one of {POLICIES}")
+        self.policy = policy
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._upgrading = False
+        self._waiting_writers = 0
+        self._waiting_readers = 0
+        self._phase = 0            # bumped on every write release
+        self._admitted = 0         # phase-fair: readers let in by the last release, not yet entered
+        self.waits = LatencyStats()
+        self.timeouts = {"read": 0, "write": 0}
+
+    def _reader_may_enter(self, arrival_phase: int) -> bool:
+        if self._writer:
+            return False
+        if self.policy == "reader":
+            return True
+        if self.policy == "writer":
+            return not self._waiting_writers
+        return not self._waiting_writers or self._phase > arrival_phase
+
+    def _writer_may_enter(self) -> bool:
+        return not self._writer and not self._readers and not self._admitted and not self._upgrading
+
+    def acquire_read(self, timeout: float = None) -> bool:
+        start = perf_counter_ns()
+        with self._cond:
+            arrival_phase = self._phase
+            self._waiting_readers += 1
+            entered = self._cond.wait_for(lambda: self._reader_may_enter(arrival_phase), timeout)
+            self._waiting_readers -= 1
+            if self._phase > arrival_phase and self._admitted:
+                self._admitted -= 1
+            if entered:
+                self._readers += 1
+            else:
+                self.timeouts["read"] += 1
+        self.waits.record_ns("read", perf_counter_ns() - start)
+        return entered
+
+    def release_read(self):
+        with self._cond:
+            if self._readers <= 0:
+                raise RuntimeError("release_read() without a matching acquire_read()")
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self, timeout: float = None) -> bool:
+        start = perf_counter_ns()
+        with self._cond:
+            self._waiting_writers += 1
+            entered = self._cond.wait_for(self._writer_may_enter, timeout)
+            self._waiting_writers -= 1
+            if entered:
+                self._writer = True
+            else:
+                self.timeouts["write"] += 1
+                self._cond.notify_all()  # readers held back by this writer may go
+        self.waits.record_ns("write", perf_counter_ns() - start)
+        return entered
+
+    def release_write(self):
+        with self._cond:
+            if not self._writer:
+                raise RuntimeError("release_write() without a matching acquire_write()")
+            self._writer = False
+            self._phase += 1
+            if self.policy == "phase-fair":
+                self._admitted = self._waiting_readers
+            self._cond.notify_all()
+
+    def upgrade(self, timeout: float = None) -> bool:
+        """
+        Turns the caller's read lock into the write lock without letting another
+        writer in between. Returns False (still holding the read lock) on timeout.
+        """
+        with self._cond:
+            if self._upgrading:
+                raise RuntimeError("another reader is already upgrading; release and acquire_write() instead")
+            self._upgrading = True
+            self._waiting_writers += 1
+            self._readers -= 1
+            entered = self._cond.wait_for(
+                lambda: not self._writer and not self._readers and not self._admitted, timeout)
+            self._waiting_writers -= 1
+            self._upgrading = False
+            if entered:
+                self._writer = True
+            else:
+                self._readers += 1
+                self._cond.notify_all()
+            return entered
+
+    def downgrade(self):
+        """
+        Turns the write lock into a read lock; waiting readers may join right away.
+        """
+        with self._cond:
+            if not self._writer:
+                raise RuntimeError("downgrade() without holding the write lock")
+            self._writer = False
+            self._readers += 1
+            self._phase += 1
+            if self.policy == "phase-fair":
+                self._admitted = self._waiting_readers
+            self._cond.notify_all()
+
+    @contextmanager
+    def read_locked(self, timeout: float = None):
+        if not self.acquire_read(timeout):
+            raise TimeoutError("timed out waiting for the read lock")
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self, timeout: float = None):
+        if not self.acquire_write(timeout):
+            raise TimeoutError("timed out waiting for the write lock")
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def wait_stats(self) -> dict:
+        return {side: self.waits.summary(side) for side in ("read", "write")}
+
+
+class _PlainLock:
+    """
+    Baseline with the RWLock interface: readers and writers all take one Lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waits = LatencyStats()
+
+    @contextmanager
+    def _locked(self, side: str):
+        start = perf_counter_ns()
+        with self._lock:
+            self.waits.record_ns(side, perf_counter_ns() - start)
+            yield
+
+    def read_locked(self):
+        return self._locked("read")
+
+    def write_locked(self):
+        return self._locked("write")
+
+    def wait_stats(self) -> dict:
+        return {side: self.waits.summary(side) for side in ("read", "write")}
+
+
+def _run_mix(lock, threads: int, ops: int, read_ratio: float, hold: float) -> float:
+    """
+    Every op holds the lock for `hold` seconds (sleep: like IO under the lock,
+    the GIL is released, so concurrent readers really overlap).
+    """
+    state = {"value": 0}
+
+    def worker(seed):
+        rng = random.Random(seed)
+        plan = [rng.random() < read_ratio for _ in range(ops)]
+        start_line.wait()
+        for is_read in plan:
+            if is_read:
+                with lock.read_locked():
+                    _ = state["value"]
+                    sleep(hold)
+            else:
+                with lock.write_locked():
+                    state["value"] += 1
+                    sleep(hold)
+
+    start_line = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=worker, args=(i,), name=f"RW-{i}") for i in range(threads)]
+    for t in workers:
+        t.start()
+    start_line.wait()
+    start = perf_counter()
+    for t in workers:
+        t.join()
+    return perf_counter() - start
+
+
+VARIANTS = {"Lock": _PlainLock, **{f"RWLock({p})": (lambda p=p: RWLock(p)) for p in POLICIES}}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="RWLock policies vs a plain Lock")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--mixes", nargs="+", type=float, default=[0.9, 0.99], help="read ratios")
+    parser.add_argument("--ops", type=int, default=300, help="operations per thread")
+    parser.add_argument("--hold-us", type=float, default=100, help="time spent holding the lock per op (µs)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    log(f"🚀 RWLock benchmark: {args.threads} threads × {args.ops} ops, hold {args.hold_us:.0f}µs, "
+        f"GIL {'enabled' if gil_enabled() else 'disabled'}")
+
+    results = []
+    for ratio in args.mixes:
+        log(f"\n🧪 {ratio:.0%} reads / {1 - ratio:.0%} writes")
+        for name, factory in VARIANTS.items():
+            samples, lock = [], None
+            for _ in range(args.repeats):
+                lock = factory()
+                samples.append(_run_mix(lock, args.threads, args.ops, ratio, args.hold_us / 1e6))
+            stats = summarize(samples)
+            waits = lock.wait_stats()
+            throughput = args.threads * args.ops / stats["mean"]
+            results.append({"variant": name, "read_ratio": ratio, "threads": args.threads,
+                            "ops_per_s": throughput, "waits": waits, **stats})
+            log(f"{name:20s} {throughput:9.0f} ops/s  wait p99: read {waits['read']['p99'] * 1000:7.2f}ms, "
+                f"write {waits['write']['p99'] * 1000:7.2f}ms (max {waits['write']['max'] * 1000:7.2f}ms)")
+
+    if args.json:
+        write_results(args.json, results, meta={"ops": args.ops, "hold_us": args.hold_us})
+        log(f"💾 Saved results to '{args.json}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+sharded_accumulator.py — Per-thread accumulators: no lock on the hot path.
+
+increment_safely in lock_demo.py takes one global Lock per increment; with more
+threads they all queue on that lock (and, without the GIL, bounce its cache line
+between cores). A sharded accumulator gives every thread a private slot:
+- update() only touches the calling thread's slot — no lock, no contention,
+- value() folds all slots together when someone reads (reads are rare in metrics code),
+- slots of threads that have exited are folded into a base value and dropped.
+
+Works for anything with a merge: ShardedCounter (counts and sums), ShardedMin /
+ShardedMax, or ShardedAccumulator(fold, factory, merge) for custom state such as
+a LatencyHistogram per thread.
+
+value() is not a point-in-time snapshot: updates racing with the read may or may
+not be included — the usual trade-off for striped counters.
+
+Usage (benchmark vs a single Lock):
+    python -m src.synchronization.sharded_accumulator --threads 1 2 4 8 16 --json sharded.json
+"""
+
+import argparse
+import math
+import operator
+import sys
+import threading
+from time import perf_counter
+
+from src.utils.bench import gil_enabled, summarize, write_results
+from src.utils.logger import log
+
+
+class ShardedAccumulator:
+    """
+    fold(state, value) → state: applies one update to a thread's slot.
+    factory() → state: a fresh, empty state (e.g. int → 0).
+    merge(a, b) → state: combines two states; may update and return a, never b.
+    """
+
+    def __init__(self, fold, factory, merge=None):
+        self._fold = fold
+        self._factory = factory
+        self._merge = merge or fold
+        self._local = threading.local()
+        self._slots = []            # [(thread, [state])]
+        self._lock = threading.Lock()
+        self._base = factory()      # folded slots of threads that have exited
+
+    def _slot(self) -> list:
+        slot = [self._factory()]
+        self._local.slot = slot
+        with self._lock:
+            self._slots.append((threading.current_thread(), slot))
+        return slot
+
+    def update(self, value):
+        try:
+            slot = self._local.slot
+        except AttributeError:
+            slot = self._slot()
+        slot[0] = self._fold(slot[0], value)
+
+    def value(self):
+        with self._lock:
+            live = []
+            for thread, slot in self._slots:
+                if thread.is_alive():
+                    live.append((thread, slot))
+                else:
+                    self._base = self._merge(self._base, slot[0])  # no more writes to this slot
+            self._slots = live
+            result = self._merge(self._factory(), self._base)
+            for _, slot in live:
+                result = self._merge(result, slot[0])
+        return result
+
+
+class ShardedCounter(ShardedAccumulator):
+    def __init__(self, start=0):
+        super().__init__(operator.add, type(start))
+        self._base = start
+
+    def add(self, amount=1):
+        try:
+            slot = self._local.slot
+        except AttributeError:
+            slot = self._slot()
+        slot[0] += amount
+
+
+class ShardedMin(ShardedAccumulator):
+    def __init__(self):
+        super().__init__(min, lambda: math.inf)
+
+
+class ShardedMax(ShardedAccumulator):
+    def __init__(self):
+        super().__init__(max, lambda: -math.inf)
+
+
+def _locked_counter_run(threads: int, ops: int) -> float:
+    lock = threading.Lock()
+    total = [0]
+
+    def worker():
+        for _ in range(ops):
+            with lock:
+                total[0] += 1
+
+    elapsed = _run(worker, threads)
+    assert total[0] == threads * ops
+    return elapsed
+
+
+def _sharded_counter_run(threads: int, ops: int) -> float:
+    counter = ShardedCounter()
+
+    def worker():
+        add = counter.add
+        for _ in range(ops):
+            add()
+
+    elapsed = _run(worker, threads)
+    assert counter.value() == threads * ops
+    return elapsed
+
+
+def _run(worker, threads: int) -> float:
+    workers = [threading.Thread(target=worker, name=f"Adder-{i}") for i in range(threads)]
+    start = perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return perf_counter() - start
+
+
+VARIANTS = {"single-lock": _locked_counter_run, "sharded": _sharded_counter_run}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Sharded counter vs one Lock-protected counter")
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, 2, 4, 8, 16])
+    parser.add_argument("--ops", type=int, default=200_000, help="increments per thread")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    log(f"🚀 Counter benchmark: {args.ops:,} increments per thread, GIL {'enabled' if gil_enabled() else 'disabled'}")
+
+    results = []
+    for threads in args.threads:
+        line = []
+        for name, run in VARIANTS.items():
+            run(threads, args.ops // 10)  # warmup
+            samples = [run(threads, args.ops) for _ in range(args.repeats)]
+            stats = summarize(samples)
+            mops = threads * args.ops / stats["mean"] / 1e6
+            results.append({"variant": name, "threads": threads, "mops": mops, **stats})
+            line.append(f"{name} {mops:6.2f} Mops/s")
+        log(f"threads={threads:3d}  " + "  |  ".join(line))
+
+    if args.json:
+        write_results(args.json, results, meta={"ops_per_thread": args.ops, "repeats": args.repeats})
+        log(f"💾 Saved results to '{args.json}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
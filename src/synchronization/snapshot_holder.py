@@ -0,0 +1,209 @@
+"""
+snapshot_holder.py — Read-copy-update for config that is read constantly and changes rarely.
+
+Routing tables and config are read on every request. Guarding them with a Lock —
+or even an RWLock, see rw_lock.py — costs every reader a lock round trip.
+SnapshotHolder instead keeps one reference to an immutable (version, value) pair:
+- readers do a single attribute read — atomic, no lock, never blocked by writers,
+- writers build a new value off to the side and publish it by swapping the reference;
+  readers that already hold the old version keep using it undisturbed,
+- writers are serialized among themselves (update() is read-modify-write),
+- every publish bumps the version; wait_for_change() blocks until a newer one appears.
+
+Published dicts / lists / sets are frozen (read-only mapping proxy / tuple /
+frozenset) unless freeze=False, so a reader can't modify the shared version.
+
+Usage (read-throughput benchmark vs Lock / RWLock):
+    python -m src.synchronization.snapshot_holder --threads 1 4 8 16
+"""
+
+import argparse
+import sys
+import threading
+from collections import namedtuple
+from time import perf_counter, sleep
+from types import MappingProxyType
+
+from src.synchronization.rw_lock import RWLock
+from src.utils.bench import gil_enabled, summarize, write_results
+from src.utils.logger import log
+
+Versioned = namedtuple("Versioned", "version value")
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType(dict(value))
+    if isinstance(value, list):
+        return tuple(value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+class SnapshotHolder:
+    def __init__(self, value=None, freeze: bool = True):
+        self._freeze = _freeze if freeze else (lambda v: v)
+        self._current = Versioned(0, self._freeze(value))
+        self._write_lock = threading.Lock()
+        self._changed = threading.Condition(self._write_lock)
+
+    def get(self):
+        """
+        The current value. Lock-free: one reference read.
+        """
+        return self._current.value
+
+    def snapshot(self) -> Versioned:
+        """
+        The current (version, value) pair, read together in one step.
+        """
+        return self._current
+
+    @property
+    def version(self) -> int:
+        return self._current.version
+
+    def publish(self, value) -> Versioned:
+        with self._write_lock:
+            return self._publish_locked(value)
+
+    def update(self, fn) -> Versioned:
+        """
+        Publishes fn(current value). fn must build a new value, not modify the old one.
+        """
+        with self._write_lock:
+            return self._publish_locked(fn(self._current.value))
+
+    def _publish_locked(self, value) -> Versioned:
+        new = Versioned(self._current.version + 1, self._freeze(value))
+        self._current = new
+        self._changed.notify_all()
+        return new
+
+    def wait_for_change(self, since_version: int, timeout: float = None) -> Versioned:
+        """
+        Blocks until the version is newer than since_version; returns it (None on timeout).
+        """
+        current = self._current
+        if current.version > since_version:
+            return current
+        with self._changed:
+            if self._changed.wait_for(lambda: self._current.version > since_version, timeout):
+                return self._current
+        return None
+
+
+# ── Read benchmark ──────────────────────────────────────────────────────────
+
+
+def _make_config(generation: int) -> dict:
+    return {f"route-{i}": f"backend-{(i + generation) % 8}" for i in range(64)}
+
+
+class _LockedConfig:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._config = _make_config(0)
+
+    def read(self, key):
+        with self._lock:
+            return self._config[key]
+
+    def publish(self, config):
+        with self._lock:
+            self._config = config
+
+
+class _RWLockedConfig:
+    def __init__(self):
+        self._lock = RWLock("writer")
+        self._config = _make_config(0)
+
+    def read(self, key):
+        with self._lock.read_locked():
+            return self._config[key]
+
+    def publish(self, config):
+        with self._lock.write_locked():
+            self._config = config
+
+
+class _SnapshotConfig:
+    def __init__(self):
+        self._holder = SnapshotHolder(_make_config(0))
+
+    def read(self, key):
+        return self._holder.get()[key]
+
+    def publish(self, config):
+        self._holder.publish(config)
+
+
+VARIANTS = {"Lock": _LockedConfig, "RWLock": _RWLockedConfig, "SnapshotHolder": _SnapshotConfig}
+
+
+def _run_reads(config, threads: int, reads: int, publish_interval: float) -> float:
+    stop = threading.Event()
+
+    def reader():
+        read = config.read
+        start_line.wait()
+        for i in range(reads):
+            read(f"route-{i & 63}")
+
+    def writer():
+        generation = 0
+        while not stop.is_set():
+            sleep(publish_interval)
+            generation += 1
+            config.publish(_make_config(generation))
+
+    start_line = threading.Barrier(threads + 1)
+    readers = [threading.Thread(target=reader, name=f"Reader-{i}") for i in range(threads)]
+    config_writer = threading.Thread(target=writer, name="ConfigWriter")
+    config_writer.start()
+    for t in readers:
+        t.start()
+    start_line.wait()
+    start = perf_counter()
+    for t in readers:
+        t.join()
+    elapsed = perf_counter() - start
+    stop.set()
+    config_writer.join()
+    return elapsed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Read throughput: SnapshotHolder vs Lock vs RWLock")
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, 4, 8, 16])
+    parser.add_argument("--reads", type=int, default=100_000, help="reads per thread")
+    parser.add_argument("--publish-ms", type=float, default=5.0, help="a writer publishes a new config this often")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    log(f"🚀 Config read benchmark: {args.reads:,} reads/thread, a publish every {args.publish_ms}ms, "
+        f"GIL {'enabled' if gil_enabled() else 'disabled'}")
+
+    results = []
+    for threads in args.threads:
+        line = []
+        for name, factory in VARIANTS.items():
+            samples = [_run_reads(factory(), threads, args.reads, args.publish_ms / 1000)
+                       for _ in range(args.repeats)]
+            stats = summarize(samples)
+            mops = threads * args.reads / stats["mean"] / 1e6
+            results.append({"variant": name, "threads": threads, "mreads_per_s": mops, **stats})
+            line.append(f"{name} {mops:6.2f}M reads/s")
+        log(f"threads={threads:3d}  " + "  |  ".join(line))
+
+    if args.json:
+        write_results(args.json, results, meta={"reads_per_thread": args.reads, "publish_ms": args.publish_ms})
+        log(f"💾 Saved results to '{args.json}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
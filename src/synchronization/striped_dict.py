@@ -0,0 +1,212 @@
+"""
+striped_dict.py — A dict shared by many threads, without one big lock.
+
+condition_demo.py and lock_demo.py guard a single shared object with a single lock.
+For a large shared cache that serializes every reader and writer. StripedDict
+splits the keys over N stripes, each a plain dict with its own lock:
+- reads (get, [], in) take no lock — a single dict lookup is atomic in CPython,
+  and free-threaded builds keep dict operations thread-safe internally,
+- writes lock only the key's stripe, so writers to different stripes don't wait,
+- get_or_set / compute_if_absent / update are atomic read-modify-write per key,
+- snapshot() and items() copy one stripe at a time, so a writer is blocked for at
+  most one stripe's copy — the result is consistent per stripe, not globally.
+
+Note: update(key, fn) is an atomic per-key read-modify-write, not dict.update().
+
+Usage (benchmark vs dict + one Lock):
+    python -m src.synchronization.striped_dict --threads 8 --read-ratios 0.5 0.9 0.99
+"""
+
+import argparse
+import random
+import sys
+import threading
+from time import perf_counter
+
+from src.utils.bench import gil_enabled, summarize, write_results
+from src.utils.logger import log
+
+_MISSING = object()
+
+
+class StripedDict:
+    def __init__(self, stripes: int = 16):
+        self._stripes = [{} for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def _index(self, key) -> int:
+        return hash(key) % len(self._stripes)
+
+    # Lock-free reads
+
+    def get(self, key, default=None):
+        return self._stripes[self._index(key)].get(key, default)
+
+    def __getitem__(self, key):
+        return self._stripes[self._index(key)][key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._stripes[self._index(key)]
+
+    def __len__(self) -> int:
+        return sum(len(stripe) for stripe in self._stripes)
+
+    # Writes: one stripe lock
+
+    def __setitem__(self, key, value):
+        i = self._index(key)
+        with self._locks[i]:
+            self._stripes[i][key] = value
+
+    def __delitem__(self, key):
+        i = self._index(key)
+        with self._locks[i]:
+            del self._stripes[i][key]
+
+    def pop(self, key, default=_MISSING):
+        i = self._index(key)
+        with self._locks[i]:
+            if default is _MISSING:
+                return self._stripes[i].pop(key)
+            return self._stripes[i].pop(key, default)
+
+    def get_or_set(self, key, default):
+        """
+        Returns the existing value, or stores and returns default.
+        """
+        i = self._index(key)
+        value = self._stripes[i].get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._locks[i]:
+            return self._stripes[i].setdefault(key, default)
+
+    def compute_if_absent(self, key, factory):
+        """
+        Returns the existing value, or calls factory(key) once — even if many threads
+        miss at the same time — stores and returns its result.
+        """
+        i = self._index(key)
+        value = self._stripes[i].get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._locks[i]:
+            value = self._stripes[i].get(key, _MISSING)
+            if value is _MISSING:
+                value = self._stripes[i][key] = factory(key)
+            return value
+
+    def update(self, key, fn, default=None):
+        """
+        Atomically replaces the value with fn(current value, or default if missing); returns it.
+        """
+        i = self._index(key)
+        with self._locks[i]:
+            value = self._stripes[i][key] = fn(self._stripes[i].get(key, default))
+            return value
+
+    # Bulk reads: one stripe locked at a time
+
+    def snapshot(self) -> dict:
+        result = {}
+        for lock, stripe in zip(self._locks, self._stripes):
+            with lock:
+                result.update(stripe)
+        return result
+
+    def items(self):
+        for lock, stripe in zip(self._locks, self._stripes):
+            with lock:
+                copied = list(stripe.items())
+            yield from copied
+
+    def keys(self):
+        return (key for key, _ in self.items())
+
+    def __iter__(self):
+        return self.keys()
+
+
+class LockedDict:
+    """
+    Baseline: a plain dict behind one Lock, same interface as used by the benchmark.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._data.get(key, default)
+
+    def update(self, key, fn, default=None):
+        with self._lock:
+            value = self._data[key] = fn(self._data.get(key, default))
+            return value
+
+
+def _increment(value):
+    return value + 1
+
+
+def _run_mix(mapping, threads: int, ops: int, read_ratio: float, num_keys: int) -> float:
+    def worker(seed):
+        rng = random.Random(seed)
+        plan = [(rng.random() < read_ratio, rng.randrange(num_keys)) for _ in range(ops)]
+        start_line.wait()
+        get, update = mapping.get, mapping.update
+        for is_read, key in plan:
+            if is_read:
+                get(key)
+            else:
+                update(key, _increment, 0)
+
+    start_line = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=worker, args=(i,), name=f"Mixer-{i}") for i in range(threads)]
+    for t in workers:
+        t.start()
+    start_line.wait()  # plans are built; time only the operations
+    start = perf_counter()
+    for t in workers:
+        t.join()
+    return perf_counter() - start
+
+
+VARIANTS = {"dict+Lock": LockedDict, "StripedDict": StripedDict}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="StripedDict vs dict behind one Lock")
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, 4, 8, 16])
+    parser.add_argument("--read-ratios", nargs="+", type=float, default=[0.5, 0.9, 0.99])
+    parser.add_argument("--ops", type=int, default=100_000, help="operations per thread")
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    log(f"🚀 Shared dict benchmark: {args.ops:,} ops/thread over {args.keys:,} keys, "
+        f"GIL {'enabled' if gil_enabled() else 'disabled'}")
+
+    results = []
+    for ratio in args.read_ratios:
+        log(f"\n🧪 {ratio:.0%} reads / {1 - ratio:.0%} writes")
+        for threads in args.threads:
+            line = []
+            for name, factory in VARIANTS.items():
+                samples = [_run_mix(factory(), threads, args.ops, ratio, args.keys) for _ in range(args.repeats)]
+                stats = summarize(samples)
+                mops = threads * args.ops / stats["mean"] / 1e6
+                results.append({"variant": name, "threads": threads, "read_ratio": ratio, "mops": mops, **stats})
+                line.append(f"{name} {mops:6.2f} Mops/s")
+            log(f"threads={threads:3d}  " + "  |  ".join(line))
+
+    if args.json:
+        write_results(args.json, results, meta={"ops_per_thread": args.ops, "keys": args.keys})
+        log(f"💾 Saved results to '{args.json}'")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+bench.py — Small helpers shared by the benchmark scripts.
+
+- measure(): warmup + repeated timing of a callable,
+- summarize(): mean / stdev / median / 95% confidence interval of samples,
+- environment_info(): interpreter + machine description stored with results,
+- write_results() / read_results(): machine-readable JSON result files,
+- compare_results(): flag regressions between two result files,
+- int_at_least(): argparse type for counts such as --repeats.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+from time import perf_counter
+
+# Two-sided 95% Student-t critical values for 1..30 degrees of freedom
+_T95 = [
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+]
+
+
+def gil_enabled() -> bool:
+    """
+    False only on a free-threaded build running with the GIL disabled.
+    """
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_enabled is None else is_enabled()
+
+
+def environment_info() -> dict:
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "gil_enabled": gil_enabled(),
+    }
+
+
+def int_at_least(minimum: int):
+    """
+    argparse type: an int >= minimum, so bad counts fail as usage errors.
+    """
+    def parse(text: str) -> int:
+        value = int(text)
+        if value < minimum:
+            raise argparse.ArgumentTypeError(f"must be >= {minimum}, got {value}")
+        return value
+    parse.__name__ = "int"  # argparse names the type in "invalid int value" errors
+    return parse
+
+
+def measure(fn, *, warmup: int = 1, repeats: int = 5) -> list:
+    """
+    Calls fn() `warmup` times untimed, then `repeats` times; returns durations in seconds.
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        start = perf_counter()
+        fn()
+        samples.append(perf_counter() - start)
+    return samples
+
+
+def summarize(samples: list) -> dict:
+    """
+    Descriptive statistics plus the half-width of a 95% confidence interval for the mean.
+    """
+    n = len(samples)
+    if not n:
+        return {"n": 0}
+    mean = statistics.fmean(samples)
+    stdev = statistics.stdev(samples) if n > 1 else 0.0
+    t = _T95[n - 2] if 1 < n <= len(_T95) + 1 else 1.96
+    return {
+        "n": n,
+        "mean": mean,
+        "stdev": stdev,
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "ci95": t * stdev / n ** 0.5 if n > 1 else 0.0,
+    }
+
+
+def write_results(path: str, results: list, meta: dict = None):
+    payload = {"environment": environment_info(), "meta": meta or {}, "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+def read_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_results(baseline: dict, current: dict, key_fields: tuple,
+                    threshold: float = 0.05) -> list:
+    """
+    Matches results by key_fields and compares their mean times.
+
+    A change is only flagged when it exceeds `threshold` (relative) AND the two
+    95% confidence intervals do not overlap — noise alone won't trip it.
+    Returns [{key, baseline, current, change, status}], status ∈ regression/improvement/same/new.
+    """
+    def index(payload):
+        return {tuple(r[k] for k in key_fields): r for r in payload["results"]}
+
+    base_by_key = index(baseline)
+    rows = []
+    for key, cur in index(current).items():
+        base = base_by_key.get(key)
+        if base is None:
+            rows.append({"key": key, "baseline": None, "current": cur["mean"], "change": None, "status": "new"})
+            continue
+
+        change = (cur["mean"] - base["mean"]) / base["mean"] if base["mean"] else 0.0
+        overlap = abs(cur["mean"] - base["mean"]) <= cur.get("ci95", 0.0) + base.get("ci95", 0.0)
+        if change > threshold and not overlap:
+            status = "regression"
+        elif change < -threshold and not overlap:
+            status = "improvement"
+        else:
+            status = "same"
+        rows.append({"key": key, "baseline": base["mean"], "current": cur["mean"], "change": change, "status": status})
+    return rows
@@ -1,29 +1,372 @@
+import atexit
+import os
+import sys
 import threading
+import time
 from datetime import datetime
 
-# Global state to track last log time (per thread is overkill here)
-_last_log_time = None
+# Log levels (same numeric values as the stdlib logging module)
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
 
+_LEVEL_NAMES = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "WARN": WARNING, "ERROR": ERROR}
+_LEVEL_TAGS = {DEBUG: "DEBUG", WARNING: "WARN", ERROR: "ERROR"}
 
-def log(message: str, *, prefix: str = ""):
-    """
-    Logs a message with timestamp, delta since last log, and current thread name.
+# Lines below this level are discarded before any formatting happens
+_min_level = _LEVEL_NAMES.get(os.environ.get("LOG_LEVEL", "INFO").upper(), INFO)
 
-    Example:
-    [12:34:56.789 | +123ms] [Thread-1] [my_module] Starting work...
+# Per-thread state: each thread tracks the time of its own previous log line,
+# so deltas are meaningful even when many threads log concurrently.
+_thread_state = threading.local()
+
+# Active background writer (None → synchronous print on the calling thread)
+_async_writer = None
+_async_writer_lock = threading.Lock()
+
+# Callbacks that receive every emitted record (e.g. the tracer), called on the logging thread
+_listeners = []
+
+
+def _format_record(record: tuple) -> str:
+    """
+    Turns a compact log record into the final output line.
+    Runs on the calling thread in sync mode, on the writer thread in async mode.
     """
-    global _last_log_time
-    now = datetime.now()
-    now_str = now.strftime('%H:%M:%S.%f')[:-3]
-    thread_name = threading.current_thread().name
+    ts, last_ts, thread_name, prefix, message, args, suppressed = record
+    if args:
+        try:
+            message = message % args
+        except Exception as exc:
+            # Like logging.Handler.handleError: a bad argument must not lose the line
+            message = f"{message!r} % {args!r} → {type(exc).__name__}: {exc} (unformatted)"
+    if suppressed:
+        message = f"{message} (+{suppressed} suppressed)"
+
+    now_str = datetime.fromtimestamp(ts).strftime('%H:%M:%S.%f')[:-3]
     module_tag = f"[{prefix}]" if prefix else ""
 
-    # Compute time since last log
-    if _last_log_time is None:
+    if last_ts is None:
         delta_str = "   ---"
     else:
-        delta_ms = (now - _last_log_time).total_seconds() * 1000
+        delta_ms = (ts - last_ts) * 1000
         delta_str = f"+{delta_ms:6.1f}ms"
 
-    _last_log_time = now
-    print(f"[{now_str} | {delta_str}] [{thread_name}] {module_tag} {message}")
+    return f"[{now_str} | {delta_str}] [{thread_name}] {module_tag} {message}"
+
+
+class AsyncLogWriter:
+    """
+    Background writer: callers push records into a fixed-size ring buffer,
+    a dedicated thread formats and writes them to stdout in batches.
+
+    When the ring is full:
+    - policy="drop"  → the new record is discarded and counted,
+    - policy="block" → the caller waits until the writer frees a slot.
+    """
+
+    def __init__(self, capacity: int = 8192, policy: str = "drop",
+                 batch_size: int = 256, flush_interval: float = 0.05, stream=None):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        if policy not in ("drop", "block"):
+            raise ValueError(f"Unknown overflow policy: {policy!r} (expected 'drop' or 'block')")
+
+        self.capacity = capacity
+        self.policy = policy
+        self.batch_size = batch_size
+        # Wake the writer once a batch is ready — or the ring is full, if that comes first
+        self._notify_at = min(batch_size, capacity)
+        self.flush_interval = flush_interval
+        self.stream = stream if stream is not None else sys.stdout
+
+        # Preallocated ring: memory stays bounded no matter how fast callers log
+        self._ring = [None] * capacity
+        self._head = 0      # next slot to read
+        self._size = 0      # number of queued records
+        self._in_flight = 0  # records taken by the writer but not yet written
+
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: tuple) -> bool:
+        """
+        Enqueues a record. Returns False if it was dropped (full ring or closed writer).
+        """
+        with self._lock:
+            if self._closed:
+                return False
+            while self._size == self.capacity:
+                if self.policy == "drop":
+                    self.dropped += 1
+                    return False
+                self._not_full.wait()
+                if self._closed:
+                    return False
+
+            self._ring[(self._head + self._size) % self.capacity] = record
+            self._size += 1
+            if self._size >= self._notify_at:
+                self._not_empty.notify()
+            return True
+
+    def _take_batch(self) -> list:
+        """
+        Waits for records and removes up to batch_size of them from the ring.
+        Must be called without holding the lock.
+        """
+        with self._lock:
+            if self._size == 0 and not self._closed:
+                # Short timed wait: lets small bursts accumulate into one write
+                self._not_empty.wait(self.flush_interval)
+
+            count = min(self._size, self.batch_size)
+            batch = []
+            for _ in range(count):
+                batch.append(self._ring[self._head])
+                self._ring[self._head] = None
+                self._head = (self._head + 1) % self.capacity
+            self._size -= count
+            self._in_flight = count
+
+            if count:
+                self._not_full.notify_all()
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            # _write_batch handles bad records and stream errors itself: if this
+            # thread died, blocked callers, flush() and close() would wait forever
+            self._write_batch(batch)
+
+            with self._lock:
+                self._in_flight = 0
+                if self._size == 0:
+                    self._idle.notify_all()
+                    if self._closed:
+                        return
+
+    def _write_batch(self, batch: list):
+        lines = []
+        for record in batch:
+            try:
+                lines.append(_format_record(record))
+            except Exception as exc:
+                lines.append(f"[logger] ⚠️ could not format record {record!r}: {exc!r}")
+        dropped_note = self._dropped_note()
+        if dropped_note:
+            lines.append(dropped_note)
+        if lines:
+            try:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+            except Exception as exc:
+                try:
+                    sys.__stderr__.write(f"[logger] ⚠️ failed to write {len(lines)} log lines: {exc!r}\n")
+                except Exception:
+                    pass
+
+    def _dropped_note(self):
+        with self._lock:
+            new_drops = self.dropped - self._reported_dropped
+            self._reported_dropped = self.dropped
+        if new_drops:
+            return f"[logger] ⚠️ dropped {new_drops} log records (ring buffer full)"
+        return None
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Blocks until every record submitted so far has been written.
+        """
+        with self._lock:
+            self._not_empty.notify()
+            return self._idle.wait_for(lambda: self._size == 0 and self._in_flight == 0, timeout)
+
+    def close(self, timeout: float = 5.0):
+        """
+        Stops accepting records, drains the ring and joins the writer thread.
+        """
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        self._thread.join(timeout)
+
+
+def enable_async_logging(capacity: int = 8192, policy: str = "drop",
+                         batch_size: int = 256, flush_interval: float = 0.05) -> AsyncLogWriter:
+    """
+    Switches log() to asynchronous mode: records go to a bounded ring buffer
+    and are written by a background thread. Pending records are flushed on exit.
+    """
+    global _async_writer
+    with _async_writer_lock:
+        if _async_writer is not None:
+            _async_writer.close()
+        _async_writer = AsyncLogWriter(capacity, policy, batch_size, flush_interval)
+        return _async_writer
+
+
+def disable_async_logging():
+    """
+    Flushes pending records, stops the writer thread and returns to synchronous printing.
+    """
+    global _async_writer
+    with _async_writer_lock:
+        writer, _async_writer = _async_writer, None
+    if writer is not None:
+        writer.close()
+
+
+def flush_logs(timeout: float = None) -> bool:
+    """
+    Waits until all asynchronously submitted records are written (no-op in sync mode).
+    """
+    writer = _async_writer
+    if writer is None:
+        return True
+    return writer.flush(timeout)
+
+
+# Flush-on-exit guarantee: atexit runs while daemon threads are still alive
+atexit.register(disable_async_logging)
+
+
+def set_level(level):
+    """
+    Sets the minimum level that log() emits. Accepts a number or a name ("DEBUG", "WARN", ...).
+    """
+    global _min_level
+    if isinstance(level, str):
+        try:
+            level = _LEVEL_NAMES[level.upper()]
+        except KeyError:
+            raise ValueError(f"Unknown log level: {level!r}") from None
+    _min_level = level
+
+
+def add_listener(callback):
+    """
+    Registers callback(record) to be called for every emitted log record.
+    """
+    if callback not in _listeners:
+        _listeners.append(callback)
+
+
+def remove_listener(callback):
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+
+def is_enabled_for(level: int) -> bool:
+    """
+    Cheap check for guarding expensive log preparation in hot loops.
+    """
+    return level >= _min_level
+
+
+class _CallSite:
+    """
+    Sampling / rate-limiting state of one log() call site.
+    """
+    __slots__ = ("calls", "window_start", "window_count", "suppressed")
+
+    def __init__(self):
+        self.calls = 0
+        self.window_start = 0.0
+        self.window_count = 0
+        self.suppressed = 0
+
+
+# Keyed by (code object, line number) of the caller
+_call_sites = {}
+_call_sites_lock = threading.Lock()
+
+
+def _admit(site_key, every, rate, now):
+    """
+    Decides whether a sampled/rate-limited call site may emit now.
+    Returns the number of suppressed calls to report, or None if this call is suppressed.
+    """
+    with _call_sites_lock:
+        site = _call_sites.get(site_key)
+        if site is None:
+            site = _call_sites[site_key] = _CallSite()
+
+        site.calls += 1
+        if every and (site.calls - 1) % every:
+            site.suppressed += 1
+            return None
+
+        if rate:
+            # Fixed one-second windows: at most `rate` lines per window
+            if now - site.window_start >= 1.0:
+                site.window_start = now
+                site.window_count = 0
+            if site.window_count >= rate:
+                site.suppressed += 1
+                return None
+            site.window_count += 1
+
+        suppressed, site.suppressed = site.suppressed, 0
+        return suppressed
+
+
+def log(message: str, *args, prefix: str = "", level: int = INFO,
+        every: int = None, rate: float = None):
+    """
+    Logs a message with timestamp, delta since this thread's last log, and current thread name.
+
+    Formatting is lazy: pass printf-style args (log("got %s", item)) and the message
+    is only built if the line is actually emitted — in async mode, on the writer thread.
+
+    every=N  → emit only 1 of every N calls from this call site,
+    rate=N   → emit at most N lines per second from this call site.
+    Emitted lines report how many calls were suppressed since the previous one.
+
+    Example:
+    [12:34:56.789 | +123ms] [Thread-1] [my_module] Starting work...
+    """
+    if level < _min_level:
+        return
+
+    now = time.time()
+    suppressed = 0
+    if every or rate:
+        caller = sys._getframe(1)
+        suppressed = _admit((caller.f_code, caller.f_lineno), every, rate, now)
+        if suppressed is None:
+            return
+
+    if level != INFO:
+        tag = _LEVEL_TAGS.get(level, str(level))
+        if not prefix:
+            prefix = tag
+        elif prefix != tag:
+            prefix = f"{tag}:{prefix}"  # keep the level visible next to the module tag
+
+    last = getattr(_thread_state, "last_log_time", None)
+    _thread_state.last_log_time = now
+
+    record = (now, last, threading.current_thread().name, prefix, message, args, suppressed)
+
+    if _listeners:
+        for callback in _listeners:
+            callback(record)
+
+    writer = _async_writer
+    if writer is not None:
+        writer.submit(record)
+    else:
+        print(_format_record(record))